@@ -1,7 +1,18 @@
+import copy
+import functools
+import json
 import logging
 import os
 import pathlib
 
+# orjson parses considerably faster, but is not required.
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 def get_config_path(config_name: str) -> pathlib.Path:
     """Returns configuration path. Configurations are stored along
@@ -21,6 +32,31 @@ def get_config_path(config_name: str) -> pathlib.Path:
     return pathlib.Path(path)
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_config(config_path: pathlib.Path, mtime_ns: int) -> dict:
+    # Modification time is part of the cache key, so edited files are parsed
+    # again while unchanged files are parsed only once.
+    with open(config_path, "rb") as file:
+        return _loads(file.read())
+
+
+def load_config(config_name: str) -> dict:
+    """Loads configuration stored along source code. Each configuration file is
+    only read and parsed once per process, subsequent calls use the cached
+    result until the file is modified.
+
+    Args:
+        config_name (str): Config specific specifier.
+
+    Returns:
+        dict: Configuration. The returned dictionary is a copy and can be
+        modified by the caller without affecting the cache.
+    """
+    config_path = get_config_path(config_name)
+
+    return copy.deepcopy(_parse_config(config_path, config_path.stat().st_mtime_ns))
+
+
 def get_default_path() -> pathlib.Path:
     """Returns default path for storing data. Usually data is
     stored on the Desktop (~/Desktop/target_shooting).
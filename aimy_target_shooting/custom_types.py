@@ -5,14 +5,60 @@ import typing
 from enum import Enum
 from typing import Iterator, List, Optional
 
+import numpy as np
+
 Position3D = typing.Tuple[float, float, float]
 Velocity3D = typing.Tuple[float, float, float]
 
-TimeStamps = typing.List[float]
+# Trajectories are stored as contiguous float64 arrays of shape (n,)
+# for time stamps and (n, 3) for positions and velocities.
+TimeStamps = np.ndarray
 LaunchParameter = typing.Tuple[float, ...]
 
-PositionTrajectory = typing.List[Position3D]
-VelocityTrajectory = typing.List[Velocity3D]
+PositionTrajectory = np.ndarray
+VelocityTrajectory = np.ndarray
+
+# Sample shapes of trajectory samples stored in TrajectoryData.
+_SAMPLE_SHAPES = {"time_stamps": (), "positions": (3,), "velocities": (3,)}
+_MIN_BUFFER_SIZE = 64
+
+
+def _sample_property(name: str, doc: str) -> property:
+    """Generates property for trajectory samples stored in a growable
+    buffer. Only the filled part of the buffer is returned, assigned samples
+    are converted to float64 arrays and have to match the shape of the sample
+    type, otherwise a ValueError is raised. Empty lists reset the samples.
+
+    Args:
+        name (str): Name of sample type.
+        doc (str): Docstring of property.
+
+    Returns:
+        property: Property accessing the sample buffer.
+    """
+    buffer_name = f"_{name}"
+    length_name = f"_{name}_length"
+    sample_shape = _SAMPLE_SHAPES[name]
+
+    def getter(self: TrajectoryData) -> np.ndarray:
+        return getattr(self, buffer_name)[: getattr(self, length_name)]
+
+    def setter(self: TrajectoryData, value: typing.Any) -> None:
+        samples = np.asarray(value, dtype=np.float64)
+
+        if samples.ndim == 1 and samples.size == 0:
+            # Empty lists are used to reset samples.
+            samples = samples.reshape((0,) + sample_shape)
+        elif samples.ndim != len(sample_shape) + 1 or samples.shape[1:] != sample_shape:
+            raise ValueError(
+                f"Invalid shape {samples.shape} for {name}, expected "
+                f"{('n',) + sample_shape}."
+            )
+
+        setattr(self, buffer_name, samples)
+        setattr(self, length_name, len(samples))
+
+    return property(getter, setter, doc=doc)
 
 
 class TrajectoryData:
@@ -21,8 +67,14 @@ class TrajectoryData:
     positions and velocities.
     Stored variables can be fetched similar to Dicts via the keys or directly
     as object of the structure.
+    Time stamps, positions and velocities are stored as NumPy arrays. Lists of
+    tuples are only used at IO boundaries.
     """
 
+    time_stamps = _sample_property("time_stamps", "Time stamps with shape (n,).")
+    positions = _sample_property("positions", "Positions with shape (n, 3).")
+    velocities = _sample_property("velocities", "Velocities with shape (n, 3).")
+
     def __init__(self, trajectory_data: TrajectoryData = None) -> None:
         """Initiates trajectory data. Can be initialised on basis of
         other trajectory data, where the given trajectory data is copied.
@@ -40,11 +92,26 @@ class TrajectoryData:
             self.velocities: VelocityTrajectory = trajectory_data.velocities.copy()
             self.launch_param: LaunchParameter = trajectory_data.launch_param
         else:
-            self.time_stamps = []
-            self.positions = []
-            self.velocities = []
+            self.reset()
             self.launch_param = ()
 
+    def __copy__(self) -> TrajectoryData:
+        """Magic function for shallow copies. Samples are shared with the
+        copied object, but appending samples to either object does not
+        affect the other one.
+
+        Returns:
+            TrajectoryData: Shallow copy of trajectory data.
+        """
+        trajectory_data = TrajectoryData.__new__(TrajectoryData)
+        trajectory_data.__dict__.update(self.__dict__)
+
+        # Trimming the buffers forces a reallocation on the next appended sample.
+        for name in _SAMPLE_SHAPES:
+            setattr(trajectory_data, name, getattr(self, name))
+
+        return trajectory_data
+
     def __getitem__(self, key: typing.Any) -> typing.Any:
         """Magic function for dict functionality.
 
@@ -104,6 +171,27 @@ class TrajectoryData:
         self.positions = []
         self.velocities = []
 
+    def _append_to_buffer(self, name: str, value: typing.Any) -> None:
+        """Appends sample to buffer of given sample type. Buffer capacity is
+        doubled if the buffer is full, so that appending is amortised constant.
+
+        Args:
+            name (str): Name of sample type.
+            value (typing.Any): Sample to be appended.
+        """
+        buffer = getattr(self, f"_{name}")
+        length = getattr(self, f"_{name}_length")
+
+        if length == len(buffer):
+            capacity = max(2 * length, _MIN_BUFFER_SIZE)
+            grown_buffer = np.empty((capacity,) + _SAMPLE_SHAPES[name])
+            grown_buffer[:length] = buffer[:length]
+            buffer = grown_buffer
+            setattr(self, f"_{name}", buffer)
+
+        buffer[length] = value
+        setattr(self, f"_{name}_length", length + 1)
+
     def append_sample(
         self,
         ball_id: int,
@@ -126,11 +214,11 @@ class TrajectoryData:
                 self.start_time = time_stamp
             time_stamp -= self.start_time
 
-            self.time_stamps.append(time_stamp)
-            self.positions.append(position)
+            self._append_to_buffer("time_stamps", time_stamp)
+            self._append_to_buffer("positions", position)
 
-            if velocity:
-                self.velocities.append(velocity)
+            if velocity is not None and len(velocity):
+                self._append_to_buffer("velocities", velocity)
 
     def set_full_trajectory(
         self,
@@ -279,13 +367,30 @@ class TrajectoryCollection:
         """
         return self._collection[index]
 
+    def copy(self) -> TrajectoryCollection:
+        """Returns shallow copy of trajectory collection. Trajectory data objects
+        are copied, but share their stored samples with the original objects.
+        Assigning new samples to the copied objects does not affect the original
+        collection, modifying shared samples in place does.
+
+        Returns:
+            TrajectoryCollection: Shallow copy of trajectory collection.
+        """
+        shallow_collection = TrajectoryCollection()
+        shallow_collection._collection = [
+            copy.copy(trajectory_data) for trajectory_data in self._collection
+        ]
+
+        return shallow_collection
+
     def deepcopy(self) -> TrajectoryCollection:
         """Returns copy of trajectory collection without dependencies.
 
         Returns:
             TrajectoryCollection: Copied trajectory collection.
         """
-        return copy.deepcopy(TrajectoryCollection(self._collection))
+        # Initialisation with a list already copies its items without dependency.
+        return TrajectoryCollection(self._collection)
 
     def delete_item(self, index: int) -> None:
         """Deletes collection element from specified index.
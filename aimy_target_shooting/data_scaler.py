@@ -26,11 +26,12 @@ class DataScaler:
         """
         self.scaling_method = scaling_method
 
+        # Parameters are converted once, so scaling does not convert them per call.
         if bias_value is not None:
-            self.bias_value = bias_value
+            self.bias_value = np.asarray(bias_value, dtype=np.float64)
 
         if scaling_value is not None:
-            self.scaling_value = scaling_value
+            self.scaling_value = np.asarray(scaling_value, dtype=np.float64)
 
     def set_and_scale(self, data: np.ndarray) -> np.ndarray:
         """Determines the bias and scaling value of given data
@@ -59,7 +60,8 @@ class DataScaler:
         return (data - self.bias_value) / self.scaling_value
 
     def only_scale(self, data: np.ndarray) -> np.ndarray:
-        """Scales data with preset bias and scaling value.
+        """Scales data with preset bias and scaling value. Accepts a single
+        sample or a batch of samples with shape (n, d).
 
         Args:
             data (np.ndarray): Data to be scaled.
@@ -71,7 +73,8 @@ class DataScaler:
 
     def unscale(self, scaled_data: np.ndarray) -> np.ndarray:
         """Reverses scaling of given data with preset
-        bias and scaling value
+        bias and scaling value. Accepts a single sample or a batch of samples
+        with shape (n, d).
 
         Args:
             scaled_data (np.ndarray): Scaled data to be unscaled.
@@ -102,7 +105,7 @@ class DataScaler:
             data = json.load(json_file)
 
             try:
-                self.bias_value = np.array(data["bias"])
-                self.scaling_value = np.array(data["scaling"])
+                self.bias_value = np.array(data["bias"], dtype=np.float64)
+                self.scaling_value = np.array(data["scaling"], dtype=np.float64)
             except KeyError as e:
                 logging.error(f"File does not contain scaler values: {e}")
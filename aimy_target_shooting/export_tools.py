@@ -1,12 +1,99 @@
+import contextlib
 import logging
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import ContextManager, Iterator
 
 import h5py
+import numpy as np
 import pandas as pd
 
 from aimy_target_shooting.configuration import get_default_path
 from aimy_target_shooting.custom_types import TrajectoryCollection, TrajectoryData
-from aimy_target_shooting.utility import to_tuple_list
+
+# Chunk cache of opened HDF5 files, large enough to hold the chunks of whole
+# trajectories instead of the default of 1 MiB.
+_CHUNK_CACHE_BYTES = 4 * 1024 * 1024
+
+# Sample datasets are stored chunked and compressed. Shuffling bytes before
+# compression groups similar exponent bytes of float samples, gzip with the
+# lowest level is fast and readable by any HDF5 installation.
+_SAMPLE_DATASET_OPTIONS = {
+    "chunks": True,
+    "compression": "gzip",
+    "compression_opts": 1,
+    "shuffle": True,
+}
+
+
+def _open_hdf5(
+    file_path: pathlib.Path, mode: str, hdf5_file: h5py.File = None, **kwargs
+) -> ContextManager[h5py.File]:
+    """Opens HDF5 file at given path. If an opened file is given instead, it is
+    used as is and stays opened after leaving the context.
+
+    Args:
+        file_path (pathlib.Path): File location.
+        mode (str): Mode of h5py.File, e.g. "r" or "a".
+        hdf5_file (h5py.File, optional): Already opened file. Defaults to None.
+        **kwargs: Forwarded to h5py.File when opening the file.
+
+    Returns:
+        ContextManager[h5py.File]: Context providing the opened file.
+    """
+    if hdf5_file is not None:
+        return contextlib.nullcontext(hdf5_file)
+
+    return h5py.File(file_path, mode, rdcc_nbytes=_CHUNK_CACHE_BYTES, **kwargs)
+
+
+def _read_hdf5_samples(dataset: h5py.Dataset) -> np.ndarray:
+    """Reads whole dataset with one call into a float64 array, which is
+    stored by TrajectoryData without further conversion.
+
+    Args:
+        dataset (h5py.Dataset): Dataset of trajectory samples.
+
+    Returns:
+        np.ndarray: Samples with shape of the dataset.
+    """
+    samples = np.empty(dataset.shape, dtype=np.float64)
+    dataset.read_direct(samples)
+
+    return samples
+
+
+def _read_hdf5_trajectory(
+    trajectory_group: h5py.Group,
+    import_launch_param: bool = True,
+    import_velocities: bool = True,
+) -> TrajectoryData:
+    """Reads single trajectory from opened HDF5 group.
+
+    Args:
+        trajectory_group (h5py.Group): Group containing trajectory datasets.
+        import_launch_param (bool, optional): Specifier if stored launch
+        parameter should be imported. Defaults to True.
+        import_velocities (bool, optional): Specifier if stored velocities
+        should be imported. Defaults to True.
+
+    Returns:
+        TrajectoryData: Imported trajectory.
+    """
+    trajectory_data = TrajectoryData()
+
+    if import_launch_param:
+        trajectory_data["launch_param"] = tuple(trajectory_group["launch_param"][()])
+
+    trajectory_data["time_stamps"] = _read_hdf5_samples(trajectory_group["time_stamps"])
+    trajectory_data["positions"] = _read_hdf5_samples(trajectory_group["positions"])
+
+    if import_velocities:
+        trajectory_data["velocities"] = _read_hdf5_samples(
+            trajectory_group["velocities"]
+        )
+
+    return trajectory_data
 
 
 def import_from_hdf5(
@@ -15,6 +102,7 @@ def import_from_hdf5(
     file_path: pathlib.Path = None,
     import_launch_param: bool = True,
     import_velocities: bool = True,
+    hdf5_file: h5py.File = None,
 ) -> TrajectoryData:
     """Imports ball data from HDF5 file specified in path argument from specified
     group and index. Imported data is stored in TrajectoryData.
@@ -28,40 +116,25 @@ def import_from_hdf5(
         should be imported. Defaults to True.
         import_velocities (bool, optional): Specifier if stored velocities should
         be imported. Defaults to True.
+        hdf5_file (h5py.File, optional): Already opened file, e.g. an in-memory
+        file, used instead of file path. Defaults to None.
     """
-    trajectory_data = TrajectoryData()
-
-    index_str = str(index)
-
     if file_path is None:
         file_path = get_default_path() / "target_shooting" / "ball_trajectories.hdf5"
 
     # "r" specifies only read permissions
-    file = h5py.File(file_path, "r")
-
-    if import_launch_param:
-        trajectory_data["launch_param"] = tuple(file[group][index_str]["launch_param"])
-
-    trajectory_data["time_stamps"] = list(file[group][index_str]["time_stamps"])
-    trajectory_data["positions"] = to_tuple_list(
-        list(file[group][index_str]["positions"])
-    )
-
-    if import_velocities:
-        trajectory_data["velocities"] = to_tuple_list(
-            list(file[group][index_str]["velocities"])
+    with _open_hdf5(file_path, "r", hdf5_file) as file:
+        return _read_hdf5_trajectory(
+            file[group][str(index)], import_launch_param, import_velocities
         )
 
-    file.close()
-
-    return trajectory_data
-
 
 def import_all_from_hdf5(
     group: str = "originals",
     file_path: pathlib.Path = None,
     import_launch_param: bool = True,
     import_velocities: bool = True,
+    hdf5_file: h5py.File = None,
 ) -> TrajectoryCollection:
     """Imports all stored ball data from HDF5 file specified in given path argument
     from desired group. Imported data is stored in TrajectoryCollection.
@@ -75,6 +148,8 @@ def import_all_from_hdf5(
         parameter should be imported. Defaults to True.
         import_velocities (bool, optional): Specifier if stored velocities
         should be imported. Defaults to True.
+        hdf5_file (h5py.File, optional): Already opened file, e.g. an in-memory
+        file, used instead of file path. Defaults to None.
     """
     trajectory_collection = TrajectoryCollection()
 
@@ -82,29 +157,69 @@ def import_all_from_hdf5(
         file_path = get_default_path() / "target_shooting" / "ball_trajectories.hdf5"
 
     # "r" specifies only read permissions
-    file = h5py.File(file_path, "r")
+    with _open_hdf5(file_path, "r", hdf5_file) as file:
+        for index in list(file[group].keys()):
+            trajectory_data = _read_hdf5_trajectory(
+                file[group][index], import_launch_param, import_velocities
+            )
+            trajectory_collection.append(trajectory_data)
 
-    for index in list(file[group].keys()):
-        trajectory_data = TrajectoryData()
+    return trajectory_collection
 
-        if import_launch_param:
-            trajectory_data["launch_param"] = tuple(file[group][index]["launch_param"])
 
-        trajectory_data["time_stamps"] = list(file[group][index]["time_stamps"])
-        trajectory_data["positions"] = to_tuple_list(
-            list(file[group][index]["positions"])
-        )
+def iterate_batches_from_hdf5(
+    group: str = "originals",
+    file_path: pathlib.Path = None,
+    batch_size: int = 64,
+    import_launch_param: bool = True,
+    import_velocities: bool = True,
+    hdf5_file: h5py.File = None,
+) -> Iterator[TrajectoryCollection]:
+    """Imports stored ball data from HDF5 file in batches of trajectories.
+    In contrast to import_all_from_hdf5 only one batch is held in memory,
+    so large files can be processed batch by batch. A file opened from the
+    file path stays opened until the iterator is exhausted or closed.
 
-        if import_velocities:
-            trajectory_data["velocities"] = to_tuple_list(
-                list(file[group][index]["velocities"])
-            )
+    Args:
+        group (str, optional): Nested group within HDF5 file. Defaults to
+        "originals".
+        file_path (pathlib.Path, optional): Path object specifying file location.
+        Defaults to None.
+        batch_size (int, optional): Maximal number of trajectories per batch.
+        Defaults to 64.
+        import_launch_param (bool, optional): Specifier if stored launch
+        parameter should be imported. Defaults to True.
+        import_velocities (bool, optional): Specifier if stored velocities
+        should be imported. Defaults to True.
+        hdf5_file (h5py.File, optional): Already opened file, e.g. an in-memory
+        file, used instead of file path. Defaults to None.
 
-        trajectory_collection.append(trajectory_data)
+    Raises:
+        ValueError: Raised if batch size is not positive.
 
-    file.close()
+    Yields:
+        Iterator[TrajectoryCollection]: Batches of imported trajectories.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size has to be positive, {batch_size} given.")
 
-    return trajectory_collection
+    if file_path is None:
+        file_path = get_default_path() / "target_shooting" / "ball_trajectories.hdf5"
+
+    # "r" specifies only read permissions
+    with _open_hdf5(file_path, "r", hdf5_file) as file:
+        indices = list(file[group].keys())
+
+        for start in range(0, len(indices), batch_size):
+            trajectory_collection = TrajectoryCollection()
+
+            for index in indices[start : start + batch_size]:
+                trajectory_data = _read_hdf5_trajectory(
+                    file[group][index], import_launch_param, import_velocities
+                )
+                trajectory_collection.append(trajectory_data)
+
+            yield trajectory_collection
 
 
 def export_to_hdf5(
@@ -112,6 +227,7 @@ def export_to_hdf5(
     directory_path: pathlib.Path = None,
     prefix: str = "ball_trajectories",
     clear_storage: bool = False,
+    hdf5_file: h5py.File = None,
 ) -> None:
     """Exports stored ball data in TrajectoryCollection to HDF5 file specified in path
     argument. Name of file can be specified via prefix argument.
@@ -124,6 +240,9 @@ def export_to_hdf5(
         "ball_trajectories".
         clear_storage (bool, optional): Specifier if ball data should be cleared after
         export. Defaults to False.
+        hdf5_file (h5py.File, optional): Already opened writable file, e.g. an
+        in-memory file, used instead of directory path and prefix. Defaults to
+        None.
 
     Raises:
         IndexError: Raised if no data is stored in TrajectoryCollection.
@@ -131,49 +250,63 @@ def export_to_hdf5(
     if not trajectory_collection:
         raise IndexError("No trajectory is stored in trajectory collection.")
 
-    if directory_path is None:
-        directory_path = get_default_path() / "target_shooting"
+    file_path = None
 
-    pathlib.Path(directory_path).mkdir(parents=True, exist_ok=True)
-    file_path = directory_path / (prefix + ".hdf5")
+    if hdf5_file is None:
+        if directory_path is None:
+            directory_path = get_default_path() / "target_shooting"
 
-    file = h5py.File(file_path, "a")
+        pathlib.Path(directory_path).mkdir(parents=True, exist_ok=True)
+        file_path = directory_path / (prefix + ".hdf5")
 
-    if "originals" not in file.keys():
-        dataset = file.create_group("originals")
-    else:
-        dataset = file["originals"]
+    # "a" appends to an existing file, so repeated exports extend the stored groups.
+    # All trajectories are written within one opening of the file, the latest
+    # file format indexes the large number of trajectory groups more efficiently.
+    with _open_hdf5(file_path, "a", hdf5_file, libver="latest") as file:
+        if "originals" not in file.keys():
+            dataset = file.create_group("originals")
+        else:
+            dataset = file["originals"]
 
-    if list(dataset.keys()):
-        current_iter = max([int(i) for i in dataset.keys()]) + 1
-    else:
-        current_iter = 0
+        if list(dataset.keys()):
+            current_iter = max([int(i) for i in dataset.keys()]) + 1
+        else:
+            current_iter = 0
 
-    for sample in trajectory_collection:
-        iteration = dataset.create_group(str(current_iter))
+        # Trajectories are written sequentially. h5py serialises all calls into
+        # the HDF5 library with a global lock, including compression, so
+        # writing from several threads would not run concurrently.
+        for sample in trajectory_collection:
+            iteration = dataset.create_group(str(current_iter))
 
-        if "launch_param" in sample:
-            iteration.create_dataset("launch_param", data=sample["launch_param"])
+            if "launch_param" in sample:
+                iteration.create_dataset("launch_param", data=sample["launch_param"])
 
-        iteration.create_dataset("time_stamps", data=sample["time_stamps"])
-        iteration.create_dataset("positions", data=sample["positions"])
+            iteration.create_dataset(
+                "time_stamps", data=sample["time_stamps"], **_SAMPLE_DATASET_OPTIONS
+            )
+            iteration.create_dataset(
+                "positions", data=sample["positions"], **_SAMPLE_DATASET_OPTIONS
+            )
 
-        if "velocities" in sample:
-            iteration.create_dataset("velocities", data=sample["velocities"])
+            if "velocities" in sample:
+                iteration.create_dataset(
+                    "velocities", data=sample["velocities"], **_SAMPLE_DATASET_OPTIONS
+                )
 
-        current_iter += 1
+            current_iter += 1
 
     if clear_storage:
         trajectory_collection.clear_collection()
 
 
-def import_from_csv(
+def _import_from_legacy_csv(
     file_path: pathlib.Path,
     import_launch_param: bool = True,
     import_velocities: bool = True,
 ) -> TrajectoryData:
-    """Imports ball data from CSV file specified in path argument.
-    Imported data is stored in TrajectoryCollection.
+    """Imports ball data from CSV file written by pandas, which stores launch
+    parameters in a separate column.
 
     Args:
         file_path (pathlib.Path): File location
@@ -193,26 +326,90 @@ def import_from_csv(
         trajectory_data["launch_param"] = launch_param
 
     # Import time stamps
-    time_stamps = df["time_stamps"].tolist()
-    trajectory_data["time_stamps"] = list(time_stamps)
+    trajectory_data["time_stamps"] = df["time_stamps"].to_numpy()
 
     # Import trajectory
-    x = df["x"].tolist()
-    y = df["y"].tolist()
-    z = df["z"].tolist()
-
-    trajectory_data["positions"] = list([(i, j, k) for i, j, k in zip(x, y, z)])
+    trajectory_data["positions"] = df[["x", "y", "z"]].to_numpy()
 
     # Import velocities
     if import_velocities:
-        v_x = df["vx"].tolist()
-        v_y = df["vy"].tolist()
-        v_z = df["vz"].tolist()
+        trajectory_data["velocities"] = df[["vx", "vy", "vz"]].to_numpy()
+
+    return trajectory_data
+
+
+def import_from_csv(
+    file_path: pathlib.Path,
+    import_launch_param: bool = True,
+    import_velocities: bool = True,
+) -> TrajectoryData:
+    """Imports ball data from CSV file specified in path argument.
+    Imported data is stored in TrajectoryCollection. Files written by
+    earlier versions with launch parameters in a separate column are
+    supported as well.
+
+    Args:
+        file_path (pathlib.Path): File location
+        import_launch_param (bool, optional): Specifier if stored launch
+        parameter should be imported. Defaults to True.
+        import_velocities (bool, optional): Specifier if stored velocity
+        should be imported. Defaults to True.
+    """
+    lines = pathlib.Path(file_path).read_text().splitlines()
 
-        trajectory_data["velocities"] = list(
-            [(i, j, k) for i, j, k in zip(v_x, v_y, v_z)]
+    if not lines or not lines[0].startswith("#"):
+        return _import_from_legacy_csv(
+            file_path,
+            import_launch_param=import_launch_param,
+            import_velocities=import_velocities,
         )
 
+    # Header lines hold launch parameters and column names
+    launch_param = None
+    columns = []
+    n_header_lines = 0
+
+    for line in lines:
+        if not line.startswith("#"):
+            break
+
+        fields = line.lstrip("# ").split(",")
+        if fields[0] == "launch_param":
+            launch_param = tuple(float(v) for v in fields[1:])
+        else:
+            columns = fields
+
+        n_header_lines += 1
+
+    column_indices = {name: index for index, name in enumerate(columns)}
+
+    # Only requested columns are parsed
+    import_velocities = import_velocities and "vx" in column_indices
+    names = ["time_stamps", "x", "y", "z"]
+    if import_velocities:
+        names.extend(["vx", "vy", "vz"])
+
+    if n_header_lines < len(lines):
+        samples = np.loadtxt(
+            lines[n_header_lines:],
+            delimiter=",",
+            usecols=[column_indices[name] for name in names],
+            ndmin=2,
+        )
+    else:
+        samples = np.empty((0, len(names)))
+
+    trajectory_data = TrajectoryData()
+
+    if import_launch_param and launch_param is not None:
+        trajectory_data["launch_param"] = launch_param
+
+    trajectory_data["time_stamps"] = samples[:, 0]
+    trajectory_data["positions"] = samples[:, 1:4]
+
+    if import_velocities:
+        trajectory_data["velocities"] = samples[:, 4:7]
+
     return trajectory_data
 
 
@@ -220,9 +417,11 @@ def import_all_from_csv(
     directory_path: pathlib.Path,
     import_launch_param: bool = True,
     import_velocities: bool = True,
+    prefix: str = "",
 ) -> TrajectoryCollection:
     """Imports ball data from all CSV files in specified directory path argument.
-    Imported data is stored in TrajectoryCollection.
+    Imported data is stored in TrajectoryCollection. Files are read in parallel
+    and stored in order of their file names.
 
     Args:
         directory_path (str, optional): Directory location. Defaults to None.
@@ -230,22 +429,26 @@ def import_all_from_csv(
         be imported. Defaults to True.
         import_velocities (bool, optional): Specifier, if velocities should be imported.
         Defaults to True.
+        prefix (str, optional): Only files starting with prefix are imported.
+        Defaults to "".
     """
     trajectory_collection = TrajectoryCollection()
 
     if directory_path is None:
         directory_path = get_default_path() / "target_shooting"
 
-    file_paths = sorted(pathlib.Path(directory_path).glob("*.csv"))
+    file_paths = sorted(pathlib.Path(directory_path).glob(f"{prefix}*.csv"))
 
-    for path in file_paths:
-        trajectory_data = TrajectoryData()
-        trajectory_data = import_from_csv(
+    def import_file(path: pathlib.Path) -> TrajectoryData:
+        return import_from_csv(
             file_path=path,
             import_launch_param=import_launch_param,
             import_velocities=import_velocities,
         )
-        trajectory_collection.append(trajectory_data)
+
+    with ThreadPoolExecutor() as executor:
+        for trajectory_data in executor.map(import_file, file_paths):
+            trajectory_collection.append(trajectory_data)
 
     return trajectory_collection
 
@@ -287,32 +490,32 @@ def export_to_csv(
         file_name = prefix + str(index) + ".csv"
         file_path = directory_path / file_name
 
-        df = pd.DataFrame()
+        header = []
+        columns = ["time_stamps", "x", "y", "z"]
+        samples = [sample["time_stamps"][:, None], sample["positions"]]
 
         if "launch_param" in sample:
-            if len(sample["positions"]) >= 5:
-                trajectory_length = len(sample["positions"])
-                params_length = len(sample["launch_param"])
-
-                launch_param = list(sample["launch_param"])
-                launch_param.extend([""] * (trajectory_length - params_length))
-
-                df["launch_param"] = launch_param
-            else:
-                logging.warning(f"Exported data {file_name} is empty.")
-
-        df["time_stamps"] = sample["time_stamps"]
-
-        df["x"] = [i[0] for i in sample["positions"]]
-        df["y"] = [i[1] for i in sample["positions"]]
-        df["z"] = [i[2] for i in sample["positions"]]
-
-        if "velocities" in sample:
-            df["vx"] = [i[0] for i in sample["velocities"]]
-            df["vy"] = [i[1] for i in sample["velocities"]]
-            df["vz"] = [i[2] for i in sample["velocities"]]
-
-        df.to_csv(file_path)
+            launch_param = [str(v) for v in sample["launch_param"]]
+            header.append(",".join(["launch_param"] + launch_param))
+
+        if "velocities" in sample and len(sample["velocities"]):
+            columns.extend(["vx", "vy", "vz"])
+            samples.append(sample["velocities"])
+
+        header.append(",".join(columns))
+
+        if not len(sample["positions"]):
+            logging.warning(f"Exported data {file_name} is empty.")
+
+        # Samples are formatted in one call, launch parameters and column
+        # names are written as commented header lines.
+        np.savetxt(
+            file_path,
+            np.hstack(samples),
+            fmt="%.17g",
+            delimiter=",",
+            header="\n".join(header),
+        )
 
     if clear_storage:
         trajectory_collection.clear_collection()
@@ -1,10 +1,10 @@
 import logging
 
 import numpy as np
-from scipy.signal import butter, find_peaks, savgol_filter, sosfilt
+from scipy.signal import butter, savgol_filter, sosfilt
 
 from aimy_target_shooting.custom_types import TrajectoryCollection
-from aimy_target_shooting.utility import to_tuple_list
+from aimy_target_shooting.utility import find_rebound
 
 
 def filter_noisy_samples(
@@ -33,7 +33,7 @@ def filter_noisy_samples(
         raise AttributeError(f"Configuration does not include parameters. {e}")
 
     for trajectory_data in modified_trajectory_collection:
-        positions = np.array(trajectory_data.positions)
+        positions = trajectory_data.positions
 
         removal_counter = 0
         removal_indices = []
@@ -62,10 +62,15 @@ def filter_noisy_samples(
                     removal_counter += 1
                     removal_indices.append(i)
 
-        for idx in sorted(removal_indices, reverse=True):
-            del trajectory_data.time_stamps[idx]
-            del trajectory_data.positions[idx]
-            del trajectory_data.velocities[idx]
+        trajectory_data.time_stamps = np.delete(
+            trajectory_data.time_stamps, removal_indices, axis=0
+        )
+        trajectory_data.positions = np.delete(
+            trajectory_data.positions, removal_indices, axis=0
+        )
+        trajectory_data.velocities = np.delete(
+            trajectory_data.velocities, removal_indices, axis=0
+        )
 
         logging.info(f"{removal_counter} samples removed.")
 
@@ -113,10 +118,15 @@ def filter_samples_outside_region(
                     delete_indices.append(idx)
                     break
 
-        for idx in sorted(delete_indices, reverse=True):
-            del trajectory_data["time_stamps"][idx]
-            del trajectory_data["positions"][idx]
-            del trajectory_data["velocities"][idx]
+        trajectory_data["time_stamps"] = np.delete(
+            trajectory_data["time_stamps"], delete_indices, axis=0
+        )
+        trajectory_data["positions"] = np.delete(
+            trajectory_data["positions"], delete_indices, axis=0
+        )
+        trajectory_data["velocities"] = np.delete(
+            trajectory_data["velocities"], delete_indices, axis=0
+        )
 
     return modified_trajectory_collection
 
@@ -150,20 +160,16 @@ def filter_samples_after_first_rebound(
     modified_trajectory_collection = trajectory_collection.deepcopy()
 
     for trajectory_data in modified_trajectory_collection:
-        time_stamps = np.array(trajectory_data.time_stamps)
-        positions = np.array(trajectory_data.positions)
-        velocities = np.array(trajectory_data.velocities)
-
-        positions_axis = positions[:, 2].copy()
-
-        positions_axis -= offset
-        positions_axis *= -1
+        time_stamps = trajectory_data.time_stamps
+        positions = trajectory_data.positions
+        velocities = trajectory_data.velocities
 
-        discontinuity_indices = find_peaks(
-            positions_axis,
-            height=threshold,
-            distance=distance,
-        )[0]
+        discontinuity_indices = find_rebound(
+            positions,
+            detection_height=offset,
+            detection_threshold=threshold,
+            detection_distance=distance,
+        )
 
         if discontinuity_indices.any():
             time_stamps = time_stamps[0 : discontinuity_indices[0] + 1]
@@ -189,9 +195,9 @@ def filter_samples_after_time_stamp(
     modified_trajectory_collection = trajectory_collection.deepcopy()
 
     for trajectory_data in modified_trajectory_collection:
-        time_stamps = np.array(trajectory_data.time_stamps)
-        positions = np.array(trajectory_data.positions)
-        velocities = np.array(trajectory_data.velocities)
+        time_stamps = trajectory_data.time_stamps
+        positions = trajectory_data.positions
+        velocities = trajectory_data.velocities
 
         remove_indices = np.nonzero(time_stamps > max_time_stamp)[0]
 
@@ -260,8 +266,8 @@ def smooth_samples(
                 sos = butter(order, cutoff_frequency, "lowpass", output="sos")
                 velocities[:, i] = sosfilt(sos, velocities[:, i])
 
-        trajectory_data.positions = to_tuple_list(positions)
-        trajectory_data.velocities = to_tuple_list(velocities)
+        trajectory_data.positions = positions
+        trajectory_data.velocities = velocities
 
     return smoothed_trajectory_collection
 
@@ -292,9 +298,7 @@ def remove_patchy_trajectories(
 
     for idx in reversed(range(len(modified_trajectory_collection))):
         trajectory_data = modified_trajectory_collection.get_item(idx)
-        time_stamps = np.array(trajectory_data.time_stamps)
-
-        gaps = np.diff(time_stamps)
+        gaps = np.diff(trajectory_data.time_stamps)
 
         if np.max(gaps) > max_patch_size:
             modified_trajectory_collection.delete_item(idx)
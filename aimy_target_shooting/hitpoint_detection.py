@@ -3,6 +3,7 @@ from scipy.interpolate import InterpolatedUnivariateSpline, make_interp_spline
 from scipy.signal import find_peaks
 
 from aimy_target_shooting.custom_types import TrajectoryCollection, TrajectoryData
+from aimy_target_shooting.utility import find_rebound
 
 
 class HitPointDetection:
@@ -113,8 +114,8 @@ class HitPointDetection:
         by offset and axis. This function is used, if not a rebound
         point is searched but crossings with any virtual plane.
         """
-        time_stamps = np.array(self.trajectory_data["time_stamps"])
-        positions = np.array(self.trajectory_data["positions"])
+        time_stamps = self.trajectory_data["time_stamps"]
+        positions = self.trajectory_data["positions"]
 
         positions_offset = positions[:, self.axis] - self.offset
         univariate_spline = InterpolatedUnivariateSpline(time_stamps, positions_offset)
@@ -138,17 +139,12 @@ class HitPointDetection:
         """Extracts discontinuities on basis of position peaks. This is
         used to find first candidates for rebound points.
         """
-        positions = np.array(self.trajectory_data["positions"])
-        positions_axis = positions[:, 2]
-
-        positions_axis -= self.TABLE_HEIGHT
-        positions_axis *= -1
-
-        discontinuity_indices = find_peaks(
-            positions_axis,
-            height=self.position_threshold,
-            distance=self.distance,
-        )[0]
+        discontinuity_indices = find_rebound(
+            self.trajectory_data["positions"],
+            detection_height=self.TABLE_HEIGHT,
+            detection_threshold=self.position_threshold,
+            detection_distance=self.distance,
+        )
 
         self.trajectory_data["distance"] = self.distance
         self.trajectory_data["position_threshold"] = self.position_threshold
@@ -158,8 +154,8 @@ class HitPointDetection:
         """Extracts discontuinities on basis of acceleration jumps.
         This is used to find first candidates for rebound points.
         """
-        time_stamps = np.array(self.trajectory_data["time_stamps"])
-        positions = np.array(self.trajectory_data["positions"])
+        time_stamps = self.trajectory_data["time_stamps"]
+        positions = self.trajectory_data["positions"]
 
         velocities = np.gradient(positions[:, self.axis], time_stamps)
         accelerations = np.gradient(velocities, time_stamps)
@@ -262,15 +258,15 @@ class HitPointDetection:
 
         for idx in discontinuity_indices:
             hitpoint_time_stamps.append(time_stamps[idx])
-            hitpoints.append(positions[idx])
+            hitpoints.append(tuple(positions[idx]))
 
         self.trajectory_data["hitpoint_time_stamps"] = hitpoint_time_stamps
         self.trajectory_data["hitpoints"] = hitpoints
 
     def _find_rebounds_by_regression(self) -> None:
         """Finds rebounds on basis of acceleration jumps."""
-        time_stamps = np.array(self.trajectory_data["time_stamps"])
-        positions = np.array(self.trajectory_data["positions"])
+        time_stamps = self.trajectory_data["time_stamps"]
+        positions = self.trajectory_data["positions"]
         approximation_indices = self.trajectory_data["approximation_indices"]
 
         hitpoint_time_stamps = []
@@ -1,5 +1,4 @@
 import logging
-from typing import Sequence
 
 import numpy as np
 
@@ -7,7 +6,9 @@ from aimy_target_shooting.custom_types import TrajectoryCollection
 
 
 def remove_further_hitpoints(
-    trajectory_collection: TrajectoryCollection, max_hitpoints: int = 1
+    trajectory_collection: TrajectoryCollection,
+    max_hitpoints: int = 1,
+    inplace: bool = False,
 ) -> TrajectoryCollection:
     """Removes all hitpoints of each single trajectory exceeding specified
     maximum number of hitpoints.
@@ -18,11 +19,15 @@ def remove_further_hitpoints(
         max_hitpoints (int, optional): Threshold value of maximum permitted
         hit points. All hit points exceeding this number are removed.
         Defaults to 1.
+        inplace (bool, optional): Modifies given collection directly instead
+        of a copy. Can be used if the caller already owns a fresh copy.
+        Defaults to False.
 
     Returns:
         TrajectoryCollection: Trajectory collection with modified hitpoints.
     """
-    trajectory_collection = trajectory_collection.deepcopy()
+    if not inplace:
+        trajectory_collection = trajectory_collection.deepcopy()
 
     for trajectory_data in trajectory_collection:
         if trajectory_data["hitpoints"]:
@@ -44,7 +49,9 @@ def remove_further_hitpoints(
 
 
 def cherry_pick_hitpoint(
-    trajectory_collection: TrajectoryCollection, index_hitpoint: int = 1
+    trajectory_collection: TrajectoryCollection,
+    index_hitpoint: int = 1,
+    inplace: bool = False,
 ) -> TrajectoryCollection:
     """Utility function for removing all detected hitpoints not specified by
     index_hitpoint from TrajectoryCollection.
@@ -54,6 +61,9 @@ def cherry_pick_hitpoint(
         with hit points attached
         index_hitpoint (int, optional): Index of desired hit point.
         For example, only keep the first hit point. Defaults to 1.
+        inplace (bool, optional): Modifies given collection directly instead
+        of a copy. Can be used if the caller already owns a fresh copy.
+        Defaults to False.
 
     Raises:
         IndexError: Raised if index exceeds number of hit points of one
@@ -62,7 +72,8 @@ def cherry_pick_hitpoint(
     Returns:
         TrajectoryCollection: Collection with cherry picked hit points.
     """
-    trajectory_collection = trajectory_collection.deepcopy()
+    if not inplace:
+        trajectory_collection = trajectory_collection.deepcopy()
 
     for trajectory_data in trajectory_collection:
         try:
@@ -78,6 +89,7 @@ def cherry_pick_hitpoint(
 def average_close_hitpoints(
     trajectory_collection: TrajectoryCollection,
     tolerated_euclidian_distance: float = 0.1,
+    inplace: bool = False,
 ) -> TrajectoryCollection:
     """Averages hitpoints which are smaller than the tolerated Euclidian
     distance between each point. Close hitpoints are only averaged if they
@@ -89,45 +101,44 @@ def average_close_hitpoints(
         tolerated_euclidian_distance (float, optional): Two adjacent points
         which are smaller than the tolerated distance are merged by averaging.
         Defaults to 0.1.
+        inplace (bool, optional): Modifies given collection directly instead
+        of a copy. Can be used if the caller already owns a fresh copy.
+        Defaults to False.
 
     Returns:
         TrajectoryCollection: Ball data with averaged hitpoints of each
         trajectory.
     """
-
-    def euclidian_distance(point_1: Sequence[float], point_2: Sequence[float]):
-        euc_distance: float = np.linalg.norm(np.array(point_2) - np.array(point_1))
-        return euc_distance
-
-    def average(point_1: Sequence[float], point_2: Sequence[float]):
-        return np.average([point_1, point_2], axis=0)
-
-    trajectory_collection = trajectory_collection.deepcopy()
+    if not inplace:
+        trajectory_collection = trajectory_collection.deepcopy()
 
     for sample in trajectory_collection:
         hitpoints = sample["hitpoints"]
+        # converted once per trajectory, the merge loop then works on array rows
+        points = np.asarray(hitpoints, dtype=np.float64)
 
         averaged_hitpoints = []
 
         x = 0
         while x < len(hitpoints) - 1:
-            point_prev = hitpoints[x]
-            point_succ = hitpoints[x + 1]
+            point_prev = points[x]
+            point_succ = points[x + 1]
 
-            distance = euclidian_distance(point_prev, point_succ)
+            distance = np.linalg.norm(point_succ - point_prev)
 
             if distance < tolerated_euclidian_distance:
-                averaged_point = average(point_prev, point_succ)
+                averaged_point = (point_prev + point_succ) * 0.5
                 averaged_hitpoints.append(averaged_point)
                 x += 1
             else:
-                averaged_hitpoints.append(point_prev)
-
-                if x == (len(hitpoints) - 2):
-                    averaged_hitpoints.append(point_succ)
+                averaged_hitpoints.append(hitpoints[x])
 
             x += 1
 
+        # last hitpoint is kept if it was not merged with its predecessor
+        if x == len(hitpoints) - 1:
+            averaged_hitpoints.append(hitpoints[x])
+
         sample["hitpoints"] = averaged_hitpoints
 
     return trajectory_collection
@@ -135,6 +146,7 @@ def average_close_hitpoints(
 
 def remove_trajectories_without_hitpoints(
     trajectory_collection: TrajectoryCollection,
+    inplace: bool = False,
 ) -> TrajectoryCollection:
     """Removes all trajectores from given trajectory collection
     with empty hit point storage. For example, trajectories which
@@ -143,6 +155,9 @@ def remove_trajectories_without_hitpoints(
     Args:
         trajectory_collection (TrajectoryCollection): Collection of
         trajectories with hit point detection executed.
+        inplace (bool, optional): Modifies given collection directly instead
+        of a copy. Can be used if the caller already owns a fresh copy.
+        Defaults to False.
 
     Raises:
         ValueError: Raised if collection does not contain hit point
@@ -152,17 +167,27 @@ def remove_trajectories_without_hitpoints(
         TrajectoryCollection: Collection only with trajectories
         having stored hit points.
     """
-    trajectory_collection = trajectory_collection.deepcopy()
+    if not all(
+        hasattr(trajectory_data, "hitpoints")
+        for trajectory_data in trajectory_collection
+    ):
+        raise ValueError("Trajectory collection does not have hitpoints attached!")
 
-    for idx in reversed(range(len(trajectory_collection))):
-        trajectory_data = trajectory_collection.get_item(idx)
-        if not hasattr(trajectory_data, "hitpoints"):
-            raise ValueError("Trajectory collection does not have hitpoints attached!")
+    survivors = [
+        trajectory_data
+        for trajectory_data in trajectory_collection
+        if trajectory_data.hitpoints
+    ]
 
-        if not trajectory_data.hitpoints:
-            trajectory_collection.delete_item(idx)
+    if inplace:
+        trajectory_collection.clear_collection()
+        for trajectory_data in survivors:
+            trajectory_collection.append(trajectory_data)
 
-    return trajectory_collection
+        return trajectory_collection
+
+    # Only surviving trajectories are copied into the new collection.
+    return TrajectoryCollection(survivors)
 
 
 def sort_hitpoints_by_occurrance(
@@ -183,7 +208,6 @@ def sort_hitpoints_by_occurrance(
     Returns:
         list: List if sorted hitpoints extracted from collection.
     """
-    trajectory_collection = trajectory_collection.deepcopy()
     ordered_hitpoints = []
 
     for trajectory_data in trajectory_collection:
@@ -249,11 +273,27 @@ def count_trajectories_without_hitpoints(
         int: Number of trajectories without hit points in given
         collection.
     """
-    count = 0
-    for trajectory_data in trajectory_collection:
-        hitpoints = trajectory_data["hitpoints"]
+    return sum(
+        1
+        for trajectory_data in trajectory_collection
+        if not trajectory_data["hitpoints"]
+    )
+
 
-        if not hitpoints:
-            count += 1
+def any_trajectory_without_hitpoints(
+    trajectory_collection: TrajectoryCollection,
+) -> bool:
+    """Checks if at least one trajectory of the collection has no hit points.
+    Stops at the first trajectory without hit points, which makes it cheaper
+    than counting when only a yes/no answer is required.
 
-    return count
+    Args:
+        trajectory_collection (TrajectoryCollection): Collection
+        of trajectories with hit points detected.
+
+    Returns:
+        bool: True, if any trajectory in given collection has no hit points.
+    """
+    return any(
+        not trajectory_data["hitpoints"] for trajectory_data in trajectory_collection
+    )
@@ -1,10 +1,11 @@
 import typing
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from aimy_target_shooting.custom_types import TrajectoryCollection, TrajectoryData
 from aimy_target_shooting.hitpoint_detection import HitPointDetection
-from aimy_target_shooting.utility import cartesian_to_polar
+from aimy_target_shooting.utility import cartesian_to_polar, cartesian_to_polar_batch
 
 
 def generate_full_training_data(
@@ -29,14 +30,18 @@ def generate_full_training_data(
     for trajectory_data in trajectory_collection:
         ctl_params = trajectory_data.launch_param
 
-        for idx in range(fitting_window, len(trajectory_data)):
-            positions = trajectory_data.positions[idx]
-            velocities = extract_velocities(trajectory_data, idx, fitting_window)
+        if len(trajectory_data) <= fitting_window:
+            continue
+
+        # Sample idx is mapped to the velocity fitted on the samples
+        # idx - fitting_window to idx.
+        positions = trajectory_data.positions[fitting_window:]
+        velocities = extract_all_velocities(trajectory_data, fitting_window)[:-1]
 
-            trg_params = create_targets(positions, velocities, config)
+        trg_params = create_targets_batch(positions, velocities, config)
 
-            control_parameters.append(ctl_params)
-            target_variables.append(trg_params)
+        control_parameters.extend([ctl_params] * len(trg_params))
+        target_variables.extend(trg_params)
 
     control_parameters = np.array(control_parameters)
     target_variables = np.array(target_variables)
@@ -107,41 +112,62 @@ def create_targets(
         np.ndarray: Target parameters according to configuration
         file.
     """
+    return create_targets_batch(positions, velocities, config)[0]
+
+
+def create_targets_batch(
+    positions: np.ndarray, velocities: np.ndarray, config: dict
+) -> np.ndarray:
+    """Creates target states of several samples at once according to JSON
+    config file. Gives the same result as calling create_targets for every
+    sample.
+
+    Args:
+        positions (np.ndarray): Sample positions with shape (n, 3).
+        velocities (np.ndarray): Sample velocities with shape (n, 3).
+
+    Returns:
+        np.ndarray: Target parameters according to configuration
+        file with one row per sample.
+    """
+    positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+    velocities = np.atleast_2d(np.asarray(velocities, dtype=np.float64))
+
     trg_params = []
-    alpha, beta = compute_direction(velocities)
+    directions = cartesian_to_polar_batch(velocities)
 
     if config["dataset_generation"]["polar_transform"]:
-        positions = cartesian_to_polar(*positions)
+        positions = cartesian_to_polar_batch(positions)
 
     if config["dataset_generation"]["p_x"]:
-        trg_params.append(positions[0])
+        trg_params.append(positions[:, 0])
 
     if config["dataset_generation"]["p_y"]:
-        trg_params.append(positions[1])
+        trg_params.append(positions[:, 1])
 
     if config["dataset_generation"]["p_z"]:
-        trg_params.append(positions[2])
+        trg_params.append(positions[:, 2])
 
     if config["dataset_generation"]["v_x"]:
-        trg_params.append(velocities[0])
+        trg_params.append(velocities[:, 0])
 
     if config["dataset_generation"]["v_y"]:
-        trg_params.append(velocities[1])
+        trg_params.append(velocities[:, 1])
 
     if config["dataset_generation"]["v_z"]:
-        trg_params.append(velocities[2])
+        trg_params.append(velocities[:, 2])
 
     if config["dataset_generation"]["alpha"]:
-        trg_params.append(alpha)
+        trg_params.append(directions[:, 1])
 
     if config["dataset_generation"]["beta"]:
-        trg_params.append(beta)
+        trg_params.append(directions[:, 2])
 
     if config["dataset_generation"]["v_mag"]:
-        v_abs = np.linalg.norm(velocities)
+        v_abs = np.linalg.norm(velocities, axis=1)
         trg_params.append(v_abs)
 
-    return trg_params
+    return np.stack(trg_params, axis=1)
 
 
 def compute_direction(state: typing.List[float]) -> typing.List[float]:
@@ -195,3 +221,49 @@ def extract_velocities(
     velocities = list(coefs[1, :])
 
     return velocities
+
+
+def extract_all_velocities(
+    trajectory_data: TrajectoryData,
+    fitting_window: int,
+) -> np.ndarray:
+    """Extracts velocities of all fitting windows of a ball trajectory at once.
+    Gives the same result as calling extract_velocities for every index, but
+    computes the linear least squares fits of all windows in one batch.
+
+    Args:
+        trajectory_data (TrajectoryData): Ball trajectory.
+        fitting_window (int): Neighborhood of samples evaluated
+        for polynomial fitting.
+
+    Raises:
+        ValueError: Raised if trajectory is shorter than fitting window.
+
+    Returns:
+        np.ndarray: Velocities with shape (len(trajectory_data) - fitting_window
+        + 1, 3). Row i holds the velocity fitted on samples i to
+        i + fitting_window, i.e. the velocity extract_velocities returns for
+        index i + fitting_window.
+    """
+    if len(trajectory_data) < fitting_window:
+        raise ValueError(
+            f"Fitting window {fitting_window} exceeds length of trajectory data "
+            f"{len(trajectory_data)}."
+        )
+
+    time_stamps = np.asarray(trajectory_data.time_stamps, dtype=np.float64)
+    positions = np.asarray(trajectory_data.positions, dtype=np.float64)
+
+    # windows have shape (n_windows, fitting_window) and
+    # (n_windows, 3, fitting_window) respectively
+    time_windows = sliding_window_view(time_stamps, fitting_window)
+    position_windows = sliding_window_view(positions, fitting_window, axis=0)
+
+    time_centered = time_windows - time_windows.mean(axis=1, keepdims=True)
+    position_centered = position_windows - position_windows.mean(axis=2, keepdims=True)
+
+    # slope of linear least squares fit: cov(t, p) / var(t)
+    velocities = np.einsum("nw,ndw->nd", time_centered, position_centered)
+    velocities /= np.sum(time_centered**2, axis=1, keepdims=True)
+
+    return velocities
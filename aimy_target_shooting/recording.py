@@ -3,10 +3,6 @@ import pathlib
 import time
 from datetime import datetime
 
-import signal_handler
-import tennicam_client
-
-from aimy_target_shooting.ball_launcher_api import BallLauncherAPI
 from aimy_target_shooting.custom_types import (
     LaunchParameter,
     TrajectoryCollection,
@@ -25,18 +21,47 @@ class Recording:
     the agent.
     """
 
-    def __init__(self, config: dict) -> None:
+    def __init__(
+        self,
+        config: dict,
+        incremental_export_path: pathlib.Path = None,
+        incremental_prefix: str = "ball_trajectories",
+    ) -> None:
         """Initialises recording environment.
 
         Args:
             config (dict): Configuration file with recording parameters.
+            incremental_export_path (pathlib.Path, optional): If given, each
+            recorded trajectory is appended to a HDF5 file in this directory
+            right after recording instead of being kept in memory. Defaults
+            to None.
+            incremental_prefix (str, optional): File name of the incrementally
+            exported HDF5 file. Defaults to "ball_trajectories".
         """
         self.record_duration_s = config["recording_param"]["recording_duration"]
         self.tennicam_segment_id = config["recording_param"]["tennicam_segment_id"]
 
         self.trajectory_collection = TrajectoryCollection()
 
-        self.launcher = BallLauncherAPI(config)
+        # Frontend to tennicam is connected on first recording and reused for
+        # all following shots.
+        self._frontend = None
+
+        self.incremental_export_path = None
+        self.n_exported_trajectories = 0
+        if incremental_export_path is not None:
+            self.incremental_export_path = pathlib.Path(incremental_export_path)
+            time_stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            self.incremental_prefix = time_stamp + "_" + incremental_prefix
+
+        # Hardware libraries are imported on demand, so analysis tools can use
+        # this module without launcher and tennicam packages being installed.
+        if "launcher_ip" in config:
+            from aimy_target_shooting.ball_launcher_api import BallLauncherAPI
+
+            self.launcher = BallLauncherAPI(config)
+        else:
+            self.launcher = None
 
     def set_launch_parameters(
         self, launch_parameters: LaunchParameter, parameter_type: str = "rpm"
@@ -47,14 +72,45 @@ class Recording:
             launch_parameters (tuple): launch parameters according to convention
             phi, theta, omega top left, omega top right, omega bottom.
         """
+        launcher = self._get_launcher()
         self.launch_param = launch_parameters
         if parameter_type == "rpm":
-            self.launcher.set_rpm(*launch_parameters)
+            launcher.set_rpm(*launch_parameters)
         elif parameter_type == "actuation":
-            self.launcher.set_actuation(*launch_parameters)
+            launcher.set_actuation(*launch_parameters)
         else:
             raise AttributeError(f"Given parameter {parameter_type} is not valid.")
 
+    def _get_launcher(self):
+        """Returns ball launcher configured by launcher_ip.
+
+        Raises:
+            RuntimeError: If no launcher_ip is given in the configuration.
+
+        Returns:
+            BallLauncherAPI: Interface to the ball launcher.
+        """
+        if self.launcher is None:
+            raise RuntimeError(
+                "No ball launcher configured. Set launcher_ip in the recording "
+                "configuration to launch balls."
+            )
+
+        return self.launcher
+
+    def _get_frontend(self):
+        """Returns frontend to tennicam, which is created on first call.
+
+        Returns:
+            tennicam_client.FrontEnd: Frontend reading ball observations.
+        """
+        if self._frontend is None:
+            import tennicam_client
+
+            self._frontend = tennicam_client.FrontEnd(self.tennicam_segment_id)
+
+        return self._frontend
+
     def record_manual_launching(self, clipping_time: float) -> None:
         """Records all trajectories and clips separate trajectories.
 
@@ -62,7 +118,9 @@ class Recording:
             clipping_time (float): Time between two separate
             trajectories.
         """
-        ball_frontend = tennicam_client.FrontEnd(self.tennicam_segment_id)
+        import signal_handler
+
+        ball_frontend = self._get_frontend()
         iteration = ball_frontend.latest().get_iteration()
         signal_handler.init()  # for detecting ctrl+c
 
@@ -95,11 +153,18 @@ class Recording:
                         logging.info(
                             f"Data with length {len(trajectory_data)} recorded."
                         )
-                        self.trajectory_collection.append(trajectory_data)
-                        logging.info(
-                            f"Collection contains {len(self.trajectory_collection)}"
-                            "samples."
-                        )
+                        self._store_trajectory(trajectory_data)
+
+                        if self.incremental_export_path is None:
+                            logging.info(
+                                "Collection contains "
+                                f"{len(self.trajectory_collection)} samples."
+                            )
+                        else:
+                            logging.info(
+                                f"{self.n_exported_trajectories} trajectories "
+                                "exported."
+                            )
 
                     trajectory_data = TrajectoryData()
                     clip_flag = True
@@ -111,7 +176,9 @@ class Recording:
 
     def record(self) -> None:
         """Records one trajectory without launching."""
-        frontend = tennicam_client.FrontEnd(self.tennicam_segment_id)
+        import signal_handler
+
+        frontend = self._get_frontend()
         iteration = frontend.latest().get_iteration()
         signal_handler.init()  # for detecting ctrl+c
 
@@ -137,17 +204,18 @@ class Recording:
             logging.error(f"Error while recording ball values: {e}")
 
         logging.debug(f"Time: {time.time()- start_time_s}")
-        self.trajectory_collection.append(trajectory_data)
+        self._store_trajectory(trajectory_data)
 
     def record_and_launch(self) -> None:
         """Records ball ID, ball position, ball velocity and time stamps for
         specified recording duration after launching the ball. Ball data is
         stored in data manager.
         """
+        launcher = self._get_launcher()
         trajectory_data = TrajectoryData()
         trajectory_data.set_launch_param(self.launch_param)
 
-        frontend = tennicam_client.FrontEnd(self.tennicam_segment_id)
+        frontend = self._get_frontend()
         iteration = frontend.latest().get_iteration()
 
         start_time_s = time.time()
@@ -155,7 +223,7 @@ class Recording:
             launch_flag = True
             while time.time() - start_time_s <= self.record_duration_s:
                 if launch_flag:
-                    self.launcher.launch()
+                    launcher.launch()
                     launch_flag = False
 
                 iteration += 1
@@ -174,7 +242,30 @@ class Recording:
             logging.error(f"Error while recording ball values: {e}")
 
         logging.debug(f"Time: {time.time()- start_time_s}")
-        self.trajectory_collection.append(trajectory_data)
+        self._store_trajectory(trajectory_data)
+
+    def _store_trajectory(self, trajectory_data: TrajectoryData) -> None:
+        """Stores recorded trajectory either in trajectory collection or, if
+        incremental export is enabled, appends it directly to the HDF5 file
+        so memory usage stays constant during long recording sessions.
+
+        Args:
+            trajectory_data (TrajectoryData): Recorded trajectory.
+        """
+        if self.incremental_export_path is None:
+            self.trajectory_collection.append(trajectory_data)
+            return
+
+        single_trajectory = TrajectoryCollection()
+        single_trajectory.append(trajectory_data)
+
+        export_data(
+            trajectory_collection=single_trajectory,
+            export_path=self.incremental_export_path,
+            export_format="hdf5",
+            prefix=self.incremental_prefix,
+        )
+        self.n_exported_trajectories += 1
 
     def export_recordings(
         self,
@@ -190,6 +281,13 @@ class Recording:
             Defaults to "hdf5".
             prefix (str, optional): prefix name of exported file.
         """
+        if self.incremental_export_path is not None and not self.trajectory_collection:
+            logging.info(
+                "Trajectories already exported to "
+                f"{self.incremental_export_path / self.incremental_prefix}."
+            )
+            return
+
         now = datetime.now()
         time_stamp = now.strftime("%Y%m%d%H%M%S")
 
@@ -1,6 +1,11 @@
+import copy
 import datetime
+import functools
 import logging
+import math
 import pathlib
+import shutil
+import subprocess
 import typing
 
 import numpy as np
@@ -11,19 +16,93 @@ from aimy_target_shooting.data_scaler import DataScaler
 from aimy_target_shooting.learning_utils import generate_full_training_data
 
 
+def _pad_to_multiple(n_neurons: int, multiple: int = 8) -> int:
+    """Rounds layer width up to next multiple, so matrix multiplications map
+    onto full SIMD lanes or tensor core tiles.
+    """
+    return ((n_neurons + multiple - 1) // multiple) * multiple
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_load_model(import_path: str, mtime_ns: int) -> tf.keras.Model:
+    """Loads Keras model once per path and modification time."""
+    return tf.keras.models.load_model(import_path)
+
+
+def _load_model(import_path: pathlib.Path) -> tf.keras.Model:
+    """Returns copy of cached model, so that retraining or modifying the model
+    does not alter the cached model.
+    """
+    import_path = pathlib.Path(import_path).resolve()
+
+    # Directory modification time does not change if files are overwritten.
+    if import_path.is_dir():
+        mtime_ns = (import_path / "saved_model.pb").stat().st_mtime_ns
+    else:
+        mtime_ns = import_path.stat().st_mtime_ns
+
+    cached_model = _cached_load_model(str(import_path), mtime_ns)
+    model = tf.keras.models.clone_model(cached_model)
+    model.set_weights(cached_model.get_weights())
+
+    return model
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_load_scaler(import_path: str, mtime_ns: int) -> DataScaler:
+    """Loads scaler values once per path and modification time."""
+    scaler = DataScaler()
+    scaler.import_values(pathlib.Path(import_path))
+
+    return scaler
+
+
+def _load_scaler(import_path: pathlib.Path) -> DataScaler:
+    """Returns copy of cached scaler, so that rescaling does not alter the
+    cached values.
+    """
+    import_path = pathlib.Path(import_path).resolve()
+    scaler = _cached_load_scaler(str(import_path), import_path.stat().st_mtime_ns)
+
+    return copy.deepcopy(scaler)
+
+
 class TargetShootingNN:
-    def __init__(self, config: dict, verbose: bool = True) -> None:
+    def __init__(
+        self, config: dict, verbose: bool = True, jit_compile: bool = True
+    ) -> None:
+        """Initialises target shooting network.
+
+        Args:
+            config (dict): Configuration with dataset, architecture and training
+            parameters.
+            verbose (bool, optional): Print logging messages. Defaults to True.
+            jit_compile (bool, optional): Compiles inference with XLA. If False,
+            the model is called eagerly, e.g. on platforms without XLA support.
+            Defaults to True.
+        """
         self.model = None
         self.conf = config
         self.verbose = verbose
+        self.jit_compile = jit_compile
+
+        self.control_scaler = None
+        self.target_scaler = None
+
+        self._predict = None
+        self._predict_batch = None
 
     def load_model(self, import_path: pathlib.Path) -> None:
-        """Loads a model from given import path.
+        """Loads a model from given import path. Supports Keras (.keras) and
+        HDF5 files, SavedModel directories written by model.save can only be
+        loaded with Keras 2. Loaded models are cached per path and modification
+        time, each instance gets its own copy of the cached model.
 
         Args:
-            import_path (pathlib.Path): Location of model file.
+            import_path (pathlib.Path): Location of model directory or file.
         """
-        self.model = tf.keras.models.load_model(import_path)
+        self.model = _load_model(import_path)
+        self._predict = None
 
         if self.verbose:
             logging.info("Model loaded.")
@@ -38,33 +117,169 @@ class TargetShootingNN:
         if import_path is None:
             import_path = "/tmp/nn_model/"
 
-        self.control_scaler = DataScaler()
-        self.target_scaler = DataScaler()
-
         control_file_name = "control_scaler.json"
-        self.control_scaler.import_values(pathlib.Path(import_path + control_file_name))
+        self.control_scaler = _load_scaler(import_path + control_file_name)
 
         target_file_name = "target_scaler.json"
-        self.target_scaler.import_values(pathlib.Path(import_path + target_file_name))
+        self.target_scaler = _load_scaler(import_path + target_file_name)
+
+        self._predict = None
 
         if self.verbose:
             logging.info("Scaling loaded.")
 
-    def export_model(self, export_path: typing.Optional[pathlib.Path] = None) -> None:
+    def export_model(
+        self,
+        export_path: typing.Optional[pathlib.Path] = None,
+        save_format: str = "tf",
+    ) -> None:
         """Exports current model to external file for deployment.
 
         Args:
             export_path (typing.Optional[pathlib.Path], optional): Path where the
             exported model will be stored. Defaults to temporary directory in Linux.
+            save_format (str, optional): Either "tf" for a SavedModel directory
+            for serving with TensorFlow, "keras" for a Keras file or "h5" for a
+            HDF5 file. Only Keras and HDF5 files can be loaded again with
+            load_model. Defaults to "tf".
+
+        Raises:
+            ValueError: Raised if save format is not supported.
         """
+        default_file_names = {
+            "tf": "saved_model",
+            "keras": "model.keras",
+            "h5": "model.hdf5",
+        }
+
+        if save_format not in default_file_names:
+            raise ValueError(f"Save format {save_format} is not supported.")
+
         if export_path is None:
-            export_path = pathlib.Path("/tmp/nn_model/model.hdf5")
+            export_path = pathlib.Path("/tmp/nn_model", default_file_names[save_format])
 
-        self.model.save(export_path)
+        # Keras 3 no longer writes SavedModels with model.save, whereas export
+        # works with Keras 2 and 3. Keras and HDF5 files are identified by the
+        # file extension in both versions.
+        if save_format == "tf":
+            self.model.export(str(export_path))
+        else:
+            self.model.save(export_path)
 
         if self.verbose:
             logging.info("Model exported.")
 
+    def export_tflite_int8(
+        self,
+        representative_data: typing.Optional[np.ndarray] = None,
+        export_path: typing.Optional[pathlib.Path] = None,
+    ) -> None:
+        """Exports current model as int8 quantized TFLite model for deployment on
+        edge devices. As the stored model, the quantized model maps scaled targets
+        to scaled control parameters, hence the exported scaling is required.
+
+        Args:
+            representative_data (typing.Optional[np.ndarray], optional): Scaled
+            targets used to calibrate the quantization ranges. Defaults to the
+            first 200 samples of the scaled training targets.
+            export_path (typing.Optional[pathlib.Path], optional): Path where the
+            quantized model will be stored. Defaults to temporary directory in
+            Linux.
+        """
+        if representative_data is None:
+            representative_data = self.target_variables_norm[:200]
+
+        if export_path is None:
+            export_path = pathlib.Path("/tmp/nn_model/model_int8.tflite")
+
+        def representative_dataset() -> typing.Iterator[typing.List[np.ndarray]]:
+            for sample in representative_data:
+                yield [sample[None].astype(np.float32)]
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+        with open(export_path, "wb") as model_file:
+            model_file.write(converter.convert())
+
+        if self.verbose:
+            logging.info("Quantized model exported.")
+
+    def export_aot(
+        self,
+        export_path: typing.Optional[pathlib.Path] = None,
+        cpp_class: str = "LauncherMLP",
+    ) -> None:
+        """Compiles inference of current model and scaling ahead of time with
+        XLA into a standalone object file and C++ header, which can be linked
+        into the launcher without TensorFlow runtime. The compiled function maps
+        a single raw target with fixed shape (1, input_shape) to raw control
+        parameters. Requires saved_model_cli of a TensorFlow build with AOT
+        support.
+
+        Args:
+            export_path (typing.Optional[pathlib.Path], optional): Directory of
+            the SavedModel and the compiled files. Defaults to temporary directory
+            in Linux.
+            cpp_class (str, optional): Name of generated C++ class. Defaults to
+            "LauncherMLP".
+
+        Raises:
+            RuntimeError: Raised if saved_model_cli is not found.
+        """
+        saved_model_cli = shutil.which("saved_model_cli")
+
+        if saved_model_cli is None:
+            raise RuntimeError(
+                "saved_model_cli not found, AOT compilation requires a "
+                "TensorFlow installation providing saved_model_cli in PATH."
+            )
+
+        if export_path is None:
+            export_path = "/tmp/nn_model/aot"
+
+        export_path = pathlib.Path(export_path)
+        saved_model_path = export_path / "saved_model"
+        export_path.mkdir(parents=True, exist_ok=True)
+
+        predict = self._inference_function()
+
+        # AOT compilation requires fixed shapes, hence batch size is set to 1.
+        input_signature = [
+            tf.TensorSpec([1, self.model.input_shape[1]], tf.float32, name="target")
+        ]
+
+        @tf.function(input_signature=input_signature)
+        def serving(target: tf.Tensor) -> typing.Dict[str, tf.Tensor]:
+            return {"control_parameters": predict(target)}
+
+        tf.saved_model.save(
+            self.model, str(saved_model_path), signatures={"serving_default": serving}
+        )
+
+        subprocess.run(
+            [
+                saved_model_cli,
+                "aot_compile_cpu",
+                "--dir",
+                str(saved_model_path),
+                "--output_prefix",
+                str(export_path / "launcher_mlp"),
+                "--cpp_class",
+                cpp_class,
+                "--tag_set",
+                "serve",
+                "--signature_def_key",
+                "serving_default",
+            ],
+            check=True,
+        )
+
+        if self.verbose:
+            logging.info("Model compiled ahead of time.")
+
     def export_scaling(self, export_path: typing.Optional[pathlib.Path] = None) -> None:
         if export_path is None:
             export_path = "/tmp/nn_model/"
@@ -81,20 +296,25 @@ class TargetShootingNN:
     def generate_dataset(self, filepath: pathlib.Path) -> None:
         training_dataset = export_tools.import_all_from_hdf5(file_path=filepath)
         control_parameters, target_variables = generate_full_training_data(
-            training_dataset
+            training_dataset, self.conf
         )
 
         self.control_scaler = DataScaler()
         self.target_scaler = DataScaler()
 
+        # Keras trains in float32, storing float32 avoids a cast for every batch.
         self.control_parameters_norm = self.control_scaler.set_and_scale(
             control_parameters
-        )
-        self.target_variables_norm = self.target_scaler.set_and_scale(target_variables)
+        ).astype(np.float32, copy=False)
+        self.target_variables_norm = self.target_scaler.set_and_scale(
+            target_variables
+        ).astype(np.float32, copy=False)
 
         self.input_shape = self.target_variables_norm.shape[1]
         self.output_shape = self.control_parameters_norm.shape[1]
 
+        self._predict = None
+
         if self.verbose:
             logging.info("Dataset generated.")
 
@@ -103,6 +323,8 @@ class TargetShootingNN:
         n_layers: typing.Optional[int] = None,
         n_neurons: typing.Optional[typing.List[int]] = None,
         dropout: typing.Optional[float] = None,
+        precision_policy: typing.Optional[str] = None,
+        activation: typing.Optional[str] = None,
     ) -> None:
         """Generates multilayer perceptron neural network model.
 
@@ -113,7 +335,14 @@ class TargetShootingNN:
             Defaults to 5.
             n_layers (list): Number of layers. Defaults to 3.
             n_neurons (list): Number of neurons for each defined layer.
-            Defaults to 108, 8, and 6.
+            Defaults to 108, 8, and 6. Widths are rounded up to multiples
+            of 8.
+            precision_policy (str, optional): Keras mixed precision policy,
+            e.g. "mixed_bfloat16". The output layer is always computed in
+            float32 for numerical stability of the regression loss.
+            Defaults to value in configuration.
+            activation (str, optional): Activation of hidden layers, e.g.
+            "relu" or "gelu". Defaults to value in configuration.
 
         Returns:
             tf.keras.Model: Training model.
@@ -127,6 +356,20 @@ class TargetShootingNN:
         if dropout is None:
             dropout = self.conf["architecture"]["dropout"]
 
+        if precision_policy is None:
+            precision_policy = self.conf["architecture"].get(
+                "precision_policy", "float32"
+            )
+
+        if activation is None:
+            activation = self.conf["architecture"].get("activation", "relu")
+
+        # Float type is global in Keras, therefore it is set for every new model.
+        # The precision policy is given to the hidden layers only, so other
+        # models in the same process are not affected.
+        tf.keras.backend.set_floatx("float32")
+        policy = tf.keras.mixed_precision.Policy(precision_policy)
+
         model = tf.keras.Sequential()
 
         if len(n_neurons) < n_layers:
@@ -135,19 +378,34 @@ class TargetShootingNN:
                 f"of layers {n_layers}"
             )
 
+        n_neurons = [_pad_to_multiple(n) for n in n_neurons]
+
         model.add(tf.keras.Input(shape=self.input_shape))
-        model.add(tf.keras.layers.Dense(n_neurons[0], activation="sigmoid"))
+        model.add(
+            tf.keras.layers.Dense(n_neurons[0], activation=activation, dtype=policy)
+        )
 
         if n_layers == 2:
-            model.add(tf.keras.layers.Dropout(dropout))
-            model.add(tf.keras.layers.Dense(n_neurons[1], activation="sigmoid"))
+            model.add(tf.keras.layers.Dropout(dropout, dtype=policy))
+            model.add(
+                tf.keras.layers.Dense(n_neurons[1], activation=activation, dtype=policy)
+            )
         if n_layers > 2:
             for i in range(1, n_layers):
-                model.add(tf.keras.layers.Dense(n_neurons[i], activation="sigmoid"))
-
-        model.add(tf.keras.layers.Dense(self.output_shape, activation="linear"))
+                model.add(
+                    tf.keras.layers.Dense(
+                        n_neurons[i], activation=activation, dtype=policy
+                    )
+                )
+
+        model.add(
+            tf.keras.layers.Dense(
+                self.output_shape, activation="linear", dtype="float32"
+            )
+        )
 
         self.model = model
+        self._predict = None
 
         if self.verbose:
             logging.info("MLP model generated.")
@@ -177,9 +435,6 @@ class TargetShootingNN:
         Returns:
             tf.keras.History: Returns training history.
         """
-        training_set = self.target_variables_norm
-        training_label = self.control_parameters_norm
-
         tf.keras.backend.clear_session()
 
         try:
@@ -190,23 +445,16 @@ class TargetShootingNN:
             validation_split = self.conf["training"]["validation_split"]
             learning_rate = self.conf["training"]["learning_rate"]
             checkpoint_name = self.conf["training"]["checkpoint_name"]
+            histogram_freq = self.conf["training"].get("histogram_freq", 0)
         except Exception as e:
             raise AttributeError(f"Parameter not given in configuration file. {e}")
 
-        log_dir = "logs/fit/" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-
-        callbacks = [
-            tf.keras.callbacks.ModelCheckpoint(
-                checkpoint_name, save_best_only=True, monitor="val_loss"
-            ),
-            tf.keras.callbacks.ReduceLROnPlateau(
-                monitor="val_loss", factor=0.5, patience=100, min_lr=learning_rate
-            ),
-            tf.keras.callbacks.TensorBoard(log_dir, histogram_freq=1),
-            tf.keras.callbacks.EarlyStopping(
-                monitor="val_loss", patience=50, verbose=1
-            ),
-        ]
+        callbacks = self._generate_callbacks(
+            learning_rate, checkpoint_name, histogram_freq
+        )
+        training_data, validation_data = self._generate_datasets(
+            batch_size, validation_split
+        )
 
         self.model.compile(
             optimizer=optimizer,
@@ -217,29 +465,194 @@ class TargetShootingNN:
         )
 
         self.history = self.model.fit(
-            training_set,
-            training_label,
-            batch_size=batch_size,
+            training_data,
             epochs=epochs,
             verbose=verbose,
             callbacks=callbacks,
-            validation_split=validation_split,
+            validation_data=validation_data,
         )
 
         if self.verbose:
             logging.info("Model trained.")
 
-    def compute_control_parameters(self, target: np.ndarray) -> None:
+    def _generate_datasets(
+        self, batch_size: int, validation_split: float
+    ) -> typing.Tuple[tf.data.Dataset, typing.Optional[tf.data.Dataset]]:
+        """Generates batched training and validation datasets from the scaled
+        training data. As with validation_split in Keras, the last samples are
+        used for validation. Training samples are reshuffled every epoch and
+        batches are prefetched, so that slicing overlaps with training steps.
+
+        Args:
+            batch_size (int): Batch size.
+            validation_split (float): Fraction of samples used for validation.
+
+        Returns:
+            typing.Tuple[tf.data.Dataset, typing.Optional[tf.data.Dataset]]:
+            Training dataset and validation dataset, which is None if no samples
+            are used for validation.
+        """
+        training_set = self.target_variables_norm
+        training_label = self.control_parameters_norm
+
+        # Same split index as validation_split in Keras
+        n_training = int(math.floor(len(training_set) * (1.0 - validation_split)))
+
+        training_data = (
+            tf.data.Dataset.from_tensor_slices(
+                (training_set[:n_training], training_label[:n_training])
+            )
+            .shuffle(n_training)
+            .batch(batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+
+        validation_data = None
+
+        if n_training < len(training_set):
+            validation_data = (
+                tf.data.Dataset.from_tensor_slices(
+                    (training_set[n_training:], training_label[n_training:])
+                )
+                .batch(batch_size)
+                .prefetch(tf.data.AUTOTUNE)
+            )
+
+        return training_data, validation_data
+
+    def _generate_callbacks(
+        self,
+        learning_rate: float,
+        checkpoint_name: typing.Optional[str] = None,
+        histogram_freq: int = 0,
+    ) -> typing.List[tf.keras.callbacks.Callback]:
+        """Generates callbacks used during training.
+
+        Args:
+            learning_rate (float): Minimum learning rate for learning rate
+            reduction on plateaus.
+            checkpoint_name (typing.Optional[str], optional): File name of
+            checkpoints of best model. Checkpoints are only stored if given.
+            Defaults to None.
+            histogram_freq (int, optional): Epoch frequency of weight histograms
+            written to TensorBoard. Histograms are disabled with 0. Defaults to 0.
+
+        Returns:
+            typing.List[tf.keras.callbacks.Callback]: Training callbacks.
+        """
+        log_dir = "logs/fit/" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+        callbacks = [
+            tf.keras.callbacks.ReduceLROnPlateau(
+                monitor="val_loss", factor=0.5, patience=100, min_lr=learning_rate
+            ),
+            tf.keras.callbacks.TensorBoard(log_dir, histogram_freq=histogram_freq),
+            tf.keras.callbacks.EarlyStopping(
+                monitor="val_loss", patience=50, verbose=1
+            ),
+        ]
+
+        if checkpoint_name:
+            callbacks.append(
+                tf.keras.callbacks.ModelCheckpoint(
+                    checkpoint_name, save_best_only=True, monitor="val_loss"
+                )
+            )
+
+        return callbacks
+
+    def _inference_function(self) -> typing.Callable[[tf.Tensor], tf.Tensor]:
+        """Generates inference function mapping raw targets to raw control
+        parameters. Target scaling, model and control unscaling are fused into
+        one function, so a call crosses the Python/TensorFlow boundary only
+        once. The model is called directly instead of via model.predict, which
+        sets up a full data pipeline for every call.
+
+        Raises:
+            ValueError: Raised if model or scaling is not set.
+
+        Returns:
+            typing.Callable[[tf.Tensor], tf.Tensor]: Inference function.
+        """
+        if self.model is None or self.target_scaler is None:
+            raise ValueError("Model and scaling have to be set for inference.")
+
+        model = self.model
+
+        target_bias = tf.constant(self.target_scaler.bias_value, tf.float32)
+        target_scaling = tf.constant(self.target_scaler.scaling_value, tf.float32)
+        control_bias = tf.constant(self.control_scaler.bias_value, tf.float32)
+        control_scaling = tf.constant(self.control_scaler.scaling_value, tf.float32)
+
+        def predict(targets: tf.Tensor) -> tf.Tensor:
+            targets_normalised = (targets - target_bias) / target_scaling
+            control_normalised = model(targets_normalised, training=False)
+            return control_normalised * control_scaling + control_bias
+
+        return predict
+
+    def _build_predictor(self) -> None:
+        """Builds inference functions of current model and scaling for single
+        targets and for batches of targets. With jit_compile, inference is
+        compiled with XLA. The single target function has a fixed
+        (1, input_shape) signature, hence it is traced and compiled only once.
+        The batch function accepts any batch size, XLA compiles it once per
+        new batch size.
+        """
+        predict = self._inference_function()
+        predict_batch = predict
+
+        if self.jit_compile:
+            input_shape = self.model.input_shape[1]
+
+            predict = tf.function(
+                predict,
+                jit_compile=True,
+                input_signature=[tf.TensorSpec([1, input_shape], tf.float32)],
+            )
+            predict_batch = tf.function(
+                predict_batch,
+                jit_compile=True,
+                input_signature=[tf.TensorSpec([None, input_shape], tf.float32)],
+            )
+
+        self._predict_batch = predict_batch
+        self._predict = predict
+
+    def compute_control_parameters(self, target: np.ndarray) -> np.ndarray:
         """Computes control parameters based on given model and target.
 
         Args:
             target (np.ndarray): Target location.
+
+        Returns:
+            np.ndarray: Control parameters in float64, inference itself is
+            computed in float32.
         """
-        target_normalised = np.array([self.target_scaler.only_scale(target)])
-        control_params = self.model.predict(target_normalised)
-        control_params_unnormalised = self.control_scaler.unscale(control_params[0])
+        if self._predict is None:
+            self._build_predictor()
+
+        target = tf.constant(np.reshape(target, (1, -1)), dtype=tf.float32)
+
+        return self._predict(target).numpy()[0].astype(np.float64)
+
+    def compute_control_parameters_batch(self, targets: np.ndarray) -> np.ndarray:
+        """Computes control parameters for several targets with a single
+        model call.
+
+        Args:
+            targets (np.ndarray): Target locations with shape (n, input_shape).
+
+        Returns:
+            np.ndarray: Control parameters with shape (n, output_shape) in
+            float64, inference itself is computed in float32.
+        """
+        if self._predict is None:
+            self._build_predictor()
+
+        targets = tf.constant(targets, dtype=tf.float32)
 
-        return control_params_unnormalised
+        return self._predict_batch(targets).numpy().astype(np.float64)
 
     def __exit__(self) -> None:
         self.export_model()
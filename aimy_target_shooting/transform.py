@@ -1,5 +1,4 @@
 import math
-import typing
 
 import numpy as np
 
@@ -7,7 +6,7 @@ from aimy_target_shooting.custom_types import TrajectoryCollection, TransformTim
 
 
 def move_origin(
-    trajectory_collection: TrajectoryCollection, config: dict
+    trajectory_collection: TrajectoryCollection, config: dict, inplace: bool = False
 ) -> TrajectoryCollection:
     """Sets origin of the coordinate system of the given trajectories according
     the given reference.
@@ -18,28 +17,34 @@ def move_origin(
         All samples are subtracted by reference point. Defaults to None.
         first_point_reference (bool, optional): The first samples can be also
         used as origin and define the reference point. Defaults to False.
+        inplace (bool, optional): Modifies given collection directly. Otherwise
+        a shallow copy is modified, where only transformed samples are newly
+        allocated. Defaults to False.
 
     Returns:
         TrajectoryCollection: Collection of trajectories with transformed origin.
     """
 
     try:
-        reference_position = np.array(config["remove_bias"]["position_bias"])
+        reference_position = np.asarray(
+            config["remove_bias"]["position_bias"], dtype=np.float64
+        )
         first_point_reference = bool(config["remove_bias"]["first_point_reference"])
     except Exception as e:
         raise AttributeError(f"Parameter not included in configuration file. {e}")
 
-    modified_trajectory_collection = trajectory_collection.deepcopy()
+    if inplace:
+        modified_trajectory_collection = trajectory_collection
+    else:
+        modified_trajectory_collection = trajectory_collection.copy()
 
     for trajectory_data in modified_trajectory_collection:
-        positions = np.array(trajectory_data.positions)
+        positions = trajectory_data.positions
 
         if first_point_reference:
-            reference_position = np.average(trajectory_data.positions[0:3], axis=0)
-
-        positions -= reference_position
+            reference_position = positions[0:3].mean(axis=0)
 
-        trajectory_data.positions = [tuple(entry) for entry in positions]
+        trajectory_data.positions = positions - reference_position
 
     return modified_trajectory_collection
 
@@ -47,6 +52,7 @@ def move_origin(
 def rotate_coordinate_system(
     trajectory_collection: TrajectoryCollection,
     config: dict,
+    inplace: bool = False,
 ) -> TrajectoryCollection:
     """Rotates coordinate system around z-axis. Default coordinate
     system defines z as height direction. x- and y-direction can be
@@ -57,53 +63,59 @@ def rotate_coordinate_system(
         trajectories.
         rotation_z_rad (Optional[float], optional): Rotation around
         z-axis in radians.
+        inplace (bool, optional): Modifies given collection directly. Otherwise
+        a shallow copy is modified, where only transformed samples are newly
+        allocated. Defaults to False.
 
     Returns:
         TrajectoryCollection: Collection of trajectories with
         transformed x- and y-values.
     """
-    modified_trajectory_collection = trajectory_collection.deepcopy()
-
     try:
         rotation_z_rad = math.radians(config["coordinate_rotation"]["rotation_z_deg"])
     except Exception as e:
         raise AttributeError(f"Configuration file does not include parameters. {e}")
 
-    def calculate_rotation(point: typing.Sequence[float]):
-        rotated_point = [0.0, 0.0, 0.0]
-
-        rotated_point[0] = (
-            math.cos(rotation_z_rad) * point[0] - math.sin(rotation_z_rad) * point[1]
-        )
-        rotated_point[1] = (
-            math.sin(rotation_z_rad) * point[0] + math.cos(rotation_z_rad) * point[1]
-        )
-        rotated_point[2] = 1 * point[2]
-
-        return rotated_point
+    if inplace:
+        modified_trajectory_collection = trajectory_collection
+    else:
+        modified_trajectory_collection = trajectory_collection.copy()
+
+    cos_z = math.cos(rotation_z_rad)
+    sin_z = math.sin(rotation_z_rad)
+    rotation_matrix = np.array(
+        [
+            [cos_z, -sin_z, 0.0],
+            [sin_z, cos_z, 0.0],
+            [0.0, 0.0, 1.0],
+        ]
+    )
 
+    # Positions and velocities of all trajectories are stacked, so that the
+    # rotation is a single matrix product. Rows are points, hence rotation is
+    # applied from the right.
+    samples = []
     for trajectory_data in modified_trajectory_collection:
-        positions = []
-        velocities = []
-
-        for position in trajectory_data.positions:
-            rotated_position = calculate_rotation(position)
+        samples.extend((trajectory_data.positions, trajectory_data.velocities))
 
-            positions.append(tuple(rotated_position))
+    if not samples:
+        return modified_trajectory_collection
 
-        for velocity in trajectory_data.velocities:
-            rotated_velocity = calculate_rotation(velocity)
+    rotated_samples = np.concatenate(samples) @ rotation_matrix.T
+    split_indices = np.cumsum([len(sample) for sample in samples])[:-1]
+    rotated_samples = np.split(rotated_samples, split_indices)
 
-            velocities.append(tuple(rotated_velocity))
-
-        trajectory_data.positions = positions
-        trajectory_data.velocities = velocities
+    for idx, trajectory_data in enumerate(modified_trajectory_collection):
+        trajectory_data.positions = rotated_samples[2 * idx]
+        trajectory_data.velocities = rotated_samples[2 * idx + 1]
 
     return modified_trajectory_collection
 
 
 def change_time_stamps(
-    trajectory_collection: TrajectoryCollection, unit: TransformTimeUnits
+    trajectory_collection: TrajectoryCollection,
+    unit: TransformTimeUnits,
+    inplace: bool = False,
 ) -> TrajectoryCollection:
     """Transforms time stamps to seconds from given unit.
 
@@ -112,24 +124,29 @@ def change_time_stamps(
         trajectories.
         unit (str, optional): Unit of time stamps before transform.
         Defaults to "seconds".
+        inplace (bool, optional): Modifies given collection directly. Otherwise
+        a shallow copy is modified, where only transformed samples are newly
+        allocated. Defaults to False.
 
     Returns:
         TrajectoryCollection: Collection of trajectories with transformed
         time stamps.
     """
-    modified_trajectory_collection = trajectory_collection.deepcopy()
+    if inplace:
+        modified_trajectory_collection = trajectory_collection
+    else:
+        modified_trajectory_collection = trajectory_collection.copy()
 
     for trajectory_data in modified_trajectory_collection:
         # transform from nano seconds to seconds
-        trajectory_data.time_stamps = [
-            i * unit.value for i in trajectory_data.time_stamps
-        ]
+        trajectory_data.time_stamps = trajectory_data.time_stamps * unit.value
 
     return modified_trajectory_collection
 
 
 def reset_time_stamps(
     trajectory_collection: TrajectoryCollection,
+    inplace: bool = False,
 ) -> TrajectoryCollection:
     """Sets time stamps in order to start with 0. Time differences
     between each time stamps are maintained.
@@ -137,16 +154,23 @@ def reset_time_stamps(
     Args:
         trajectory_collection (TrajectoryCollection): Collection of
         trajectories.
+        inplace (bool, optional): Modifies given collection directly. Otherwise
+        a shallow copy is modified, where only transformed samples are newly
+        allocated. Defaults to False.
 
     Returns:
         TrajectoryCollection: Collection with trajectories starting
         with time stamp 0.
     """
-    modified_trajectory_collection = trajectory_collection.deepcopy()
+    if inplace:
+        modified_trajectory_collection = trajectory_collection
+    else:
+        modified_trajectory_collection = trajectory_collection.copy()
 
     for trajectory_data in modified_trajectory_collection:
-        trajectory_data.time_stamps = [
-            i - trajectory_data.time_stamps[0] for i in trajectory_data.time_stamps
-        ]
+        time_stamps = trajectory_data.time_stamps
+
+        if time_stamps.size:
+            trajectory_data.time_stamps = time_stamps - time_stamps[0]
 
     return modified_trajectory_collection
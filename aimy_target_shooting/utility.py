@@ -3,11 +3,95 @@ import typing
 import matplotlib.transforms as transforms
 import numpy as np
 from matplotlib.patches import Ellipse
-from scipy import interpolate
 from scipy.signal import find_peaks
 
 from aimy_target_shooting.custom_types import Position3D, Velocity3D
 
+# Conversion factor from radians to degrees.
+_RAD2DEG = 180.0 / np.pi
+
+# Launcher names of known launcher IP addresses.
+_IP_MAP = {"10.42.31.174": "v2_offset", "10.42.26.171": "v3"}
+
+# Calibrated azimuth angles in degrees for equidistant actuations.
+_PHI_ACTUATIONS = np.linspace(0.0, 1.0, 7)
+_PHI_ANGLES = np.array(
+    [
+        16.81766552,
+        12.41133775,
+        4.05559336,
+        0.0,
+        -4.26665414,
+        -11.6580105,
+        -16.54297629,
+    ]
+)
+
+# Calibrated altitude angles in degrees for equidistant actuations.
+_THETA_ACTUATIONS = np.linspace(0.0, 1.0, 5)
+_THETA_ANGLES = np.array(
+    [6.40400874, 12.17836522, 19.90385964, 28.11300675, 37.14585762]
+)
+
+
+def _linear_segments(
+    x_knots: np.ndarray, y_knots: np.ndarray
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Precomputes segments of piecewise linear function through given knots.
+
+    Args:
+        x_knots (np.ndarray): Monotonic knot positions.
+        y_knots (np.ndarray): Knot values.
+
+    Returns:
+        typing.Tuple[np.ndarray, np.ndarray, np.ndarray]: Ascending segment
+        breaks, slopes and intercepts of each segment.
+    """
+    order = np.argsort(x_knots)
+    breaks = x_knots[order]
+    values = y_knots[order]
+
+    slopes = np.diff(values) / np.diff(breaks)
+    intercepts = values[:-1] - slopes * breaks[:-1]
+
+    return breaks, slopes, intercepts
+
+
+_PHI_TO_ACTUATION = _linear_segments(_PHI_ANGLES, _PHI_ACTUATIONS)
+_ACTUATION_TO_PHI = _linear_segments(_PHI_ACTUATIONS, _PHI_ANGLES)
+_THETA_TO_ACTUATION = _linear_segments(_THETA_ANGLES, _THETA_ACTUATIONS)
+_ACTUATION_TO_THETA = _linear_segments(_THETA_ACTUATIONS, _THETA_ANGLES)
+
+
+def _interpolate(
+    x: typing.Any, segments: typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+) -> float:
+    """Evaluates piecewise linear function given by precomputed segments.
+    Values outside of the segments are not extrapolated.
+
+    Args:
+        x (typing.Any): Scalar or array to be interpolated.
+        segments (typing.Tuple[np.ndarray, np.ndarray, np.ndarray]): Segment
+        breaks, slopes and intercepts.
+
+    Raises:
+        ValueError: Raised if values are outside of interpolation range.
+
+    Returns:
+        float: Interpolated scalar or array.
+    """
+    breaks, slopes, intercepts = segments
+
+    x = np.asarray(x, dtype=np.float64)
+
+    if np.any(x < breaks[0]) or np.any(x > breaks[-1]):
+        raise ValueError("A value is outside of the interpolation range.")
+
+    # The upper end of the range belongs to the last segment.
+    index = np.minimum(np.searchsorted(breaks, x, side="right") - 1, len(slopes) - 1)
+
+    return slopes[index] * x + intercepts[index]
+
 
 def to_tuple_list(numpy_list: np.ndarray) -> typing.Union[Position3D, Velocity3D]:
     """Transforms list with position tuple from numpy
@@ -20,7 +104,7 @@ def to_tuple_list(numpy_list: np.ndarray) -> typing.Union[Position3D, Velocity3D
     Returns:
         Position3D or Velocity3D: Position3D or Velocity3D information.
     """
-    return [tuple(entry) for entry in numpy_list]
+    return list(map(tuple, np.asarray(numpy_list).tolist()))
 
 
 def to_numpy_list(
@@ -35,9 +119,10 @@ def to_numpy_list(
         List of position (or velocity) tuples.
 
     Returns:
-        typing.List[np.ndarray]: List of numpy nd.arrays.
+        typing.List[np.ndarray]: List of numpy nd.arrays, which are row views
+        of one contiguous (n, 3) array.
     """
-    return [np.array(entry) for entry in tuple_list]
+    return list(np.ascontiguousarray(tuple_list, dtype=np.float64))
 
 
 def ip_to_launcher_name(ip: str) -> str:
@@ -49,8 +134,7 @@ def ip_to_launcher_name(ip: str) -> str:
     Returns:
         str: Affiliated IP address.
     """
-    ip_str = {"10.42.31.174": "v2_offset", "10.42.26.171": "v3"}
-    return ip_str[ip]
+    return _IP_MAP[ip]
 
 
 def confidence_ellipse(x, y, ax, n_std=4.0, facecolor="none", **kwargs):
@@ -78,8 +162,17 @@ def confidence_ellipse(x, y, ax, n_std=4.0, facecolor="none", **kwargs):
     if x.size != y.size:
         raise ValueError("x and y must be the same size")
 
-    cov = np.cov(x, y)
-    pearson = cov[0, 1] / np.sqrt(cov[0, 0] * cov[1, 1])
+    # Means, variances and covariance from one pass over the centred data.
+    mean_x = np.mean(x)
+    mean_y = np.mean(y)
+    deviation_x = np.ravel(x - mean_x)
+    deviation_y = np.ravel(y - mean_y)
+
+    var_x = deviation_x @ deviation_x / (x.size - 1)
+    var_y = deviation_y @ deviation_y / (y.size - 1)
+    cov_xy = deviation_x @ deviation_y / (x.size - 1)
+
+    pearson = cov_xy / np.sqrt(var_x * var_y)
     # Using a special case to obtain the eigenvalues of this
     # two-dimensionl dataset.
     ell_radius_x = np.sqrt(1 + pearson)
@@ -95,18 +188,22 @@ def confidence_ellipse(x, y, ax, n_std=4.0, facecolor="none", **kwargs):
     # Calculating the standard deviation of x from
     # the squareroot of the variance and multiplying
     # with the given number of standard deviations.
-    scale_x = np.sqrt(cov[0, 0]) * n_std
-    mean_x = np.mean(x)
+    scale_x = np.sqrt(var_x) * n_std
 
     # calculating the stdandard deviation of y ...
-    scale_y = np.sqrt(cov[1, 1]) * n_std
-    mean_y = np.mean(y)
-
-    transf = (
-        transforms.Affine2D()
-        .rotate_deg(45)
-        .scale(scale_x, scale_y)
-        .translate(mean_x, mean_y)
+    scale_y = np.sqrt(var_y) * n_std
+
+    # Rotation by 45 degrees followed by scaling and translation, composed
+    # into a single affine matrix.
+    cos_45 = sin_45 = np.sqrt(0.5)
+    transf = transforms.Affine2D(
+        np.array(
+            [
+                [scale_x * cos_45, -scale_x * sin_45, mean_x],
+                [scale_y * sin_45, scale_y * cos_45, mean_y],
+                [0.0, 0.0, 1.0],
+            ]
+        )
     )
 
     ellipse.set_transform(transf + ax.transData)
@@ -130,12 +227,34 @@ def cartesian_to_polar(
         radius, phi and theta.
     """
     radius = np.sqrt(x**2 + y**2 + z**2)
-    phi = np.arcsin(y / np.sqrt(x**2 + y**2))
+    phi = np.arctan2(y, x)
     theta = np.arcsin(z / radius)
 
     return radius, phi, theta
 
 
+def cartesian_to_polar_batch(positions: np.ndarray) -> np.ndarray:
+    """Transforms Cartesian coordinates of several points into
+    polar / spherical coordinates.
+
+    Args:
+        positions (np.ndarray): Cartesian coordinates with shape (n, 3).
+        Single points with shape (3,) are supported as well.
+
+    Returns:
+        np.ndarray: Spherical coordinates radius, phi and theta with
+        shape (n, 3).
+    """
+    positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+    x, y, z = positions[:, 0], positions[:, 1], positions[:, 2]
+
+    radius = np.linalg.norm(positions, axis=1)
+    phi = np.arctan2(y, x)
+    theta = np.arcsin(z / radius)
+
+    return np.stack((radius, phi, theta), axis=1)
+
+
 def polar_to_cartesian(
     radius: float, phi: float, theta: float
 ) -> typing.Tuple[float, float, float]:
@@ -158,38 +277,85 @@ def polar_to_cartesian(
     return x, y, z
 
 
+def polar_to_cartesian_batch(spherical: np.ndarray) -> np.ndarray:
+    """Transforms polar / spherical coordinates of several points
+    into Cartesian coordinates.
+
+    Args:
+        spherical (np.ndarray): Spherical coordinates radius, phi and theta
+        with shape (n, 3). Single points with shape (3,) are supported as well.
+
+    Returns:
+        np.ndarray: Cartesian coordinates with shape (n, 3).
+    """
+    spherical = np.atleast_2d(np.asarray(spherical, dtype=np.float64))
+    radius, phi, theta = spherical[:, 0], spherical[:, 1], spherical[:, 2]
+
+    planar_radius = np.cos(theta) * radius
+
+    return np.stack(
+        (
+            np.cos(phi) * planar_radius,
+            np.sin(phi) * planar_radius,
+            np.sin(theta) * radius,
+        ),
+        axis=1,
+    )
+
+
 def find_rebound(
     positions: typing.Union[np.ndarray, typing.List[float]],
     detection_height: float = 0.76,
     detection_threshold: float = -0.03,
     detection_distance: int = 10,
+    out: typing.Optional[np.ndarray] = None,
 ) -> typing.List[int]:
     """Finds rebound indices.
 
     Args:
-        positions (typing.Union[np.ndarray, typing.List[float]]): Height positions
-        of a ball trajectory.
+        positions (typing.Union[np.ndarray, typing.List[float]]): Positions of a
+        ball trajectory with shape (n, 3). Stored trajectory arrays are used
+        without copying.
         detection_height (float, optional): Height for detecting rebounds.
         Defaults to 0.76.
         detection_threshold (float, optional): Detection threshold. Defaults to -0.03.
         detection_distance (int, optional): Distance parameter for checking the
         neighborhood for other rebounds. Defaults to 10.
+        out (typing.Optional[np.ndarray], optional): Preallocated buffer with at
+        least as many elements as positions. Can be reused across calls to avoid
+        allocations. Defaults to None.
 
     Returns:
         typing.List[int]: List of rebound indices.
     """
+    heights = np.asarray(positions, dtype=np.float64)[:, 2]
+
+    # Rebounds are peaks of the negated height above detection height.
+    if out is None:
+        heights_transformed = detection_height - heights
+    else:
+        heights_transformed = np.subtract(
+            detection_height, heights, out=out[: len(heights)]
+        )
+
+    # Only samples reaching the threshold can be rebounds, hence the search is
+    # restricted to the region spanned by them. One sample margin on each side
+    # keeps the neighbours required to detect peaks at the region borders.
+    candidate_indices = np.flatnonzero(heights_transformed >= detection_threshold)
+
+    if candidate_indices.size == 0:
+        return candidate_indices
 
-    positions = np.array(positions)
-    positions_unbaised = positions[:, 2] - detection_height
-    positions_transformed = -1 * positions_unbaised
+    start = max(candidate_indices[0] - 1, 0)
+    stop = candidate_indices[-1] + 2
 
     discontinuity_indices = find_peaks(
-        positions_transformed,
+        heights_transformed[start:stop],
         height=detection_threshold,
         distance=detection_distance,
     )[0]
 
-    return discontinuity_indices
+    return discontinuity_indices + start
 
 
 def f_phi(
@@ -198,21 +364,25 @@ def f_phi(
     radians: bool = True,
 ) -> float:
     """Transformation of actuation with range 0 to 1 to Azimuth angle and
-    vice versa.
+    vice versa. Arrays of actuations or angles are transformed element-wise,
+    e.g. for batches of targets.
 
     Args:
-        actuation (float, optional): Given actuation. Defaults to None.
-        phi (float, optional): Given angle value. Defaults to None.
+        actuation (float, optional): Given actuation, scalar or array.
+        Defaults to None.
+        phi (float, optional): Given angle value, scalar or array.
+        Defaults to None.
         radians (bool, optional): Specifier if given or returned angle
         should be radian. Defaults to True.
 
     Raises:
         AttributeError: Raised if neither actuation or angle are given.
         AttributeError: Raised if both actuation and angle are given.
+        ValueError: Raised if values are outside of calibrated range.
 
     Returns:
         float: Returns either angle or actuation, depending on given
-        attributes.
+        attributes. Has the shape of the given argument.
     """
     if actuation is None and phi is None:
         raise AttributeError("No argument given!")
@@ -220,39 +390,15 @@ def f_phi(
     if actuation is not None and phi is not None:
         raise AttributeError("Only specify either actuation or angle!")
 
-    phi_pos = [
-        16.81766552,
-        12.41133775,
-        4.05559336,
-        0.0,
-        -4.26665414,
-        -11.6580105,
-        -16.54297629,
-    ]
-    phi_pos_actuation = [i * (1 / 6) for i in range(7)]
-
-    output = None
-
     if phi is not None:
-        f = interpolate.interp1d(phi_pos, phi_pos_actuation)
-
         if radians:
-            phi = np.rad2deg(phi)
+            phi = phi * _RAD2DEG
 
-        actuation = f(phi)
+        return _interpolate(phi, _PHI_TO_ACTUATION)
 
-        output = actuation
+    phi_calc = _interpolate(actuation, _ACTUATION_TO_PHI)
 
-    if actuation is not None:
-        f = interpolate.interp1d(phi_pos_actuation, phi_pos)
-        phi_calc = f(actuation)
-
-        if radians:
-            phi_calc = np.radians(phi_calc)
-
-        output = phi_calc
-
-    return output
+    return np.radians(phi_calc) if radians else phi_calc
 
 
 def f_theta(
@@ -261,21 +407,25 @@ def f_theta(
     radians: bool = True,
 ):
     """Transformation of actuation with range 0 to 1 to altitude angle and
-    vice versa.
+    vice versa. Arrays of actuations or angles are transformed element-wise,
+    e.g. for batches of targets.
 
     Args:
-        actuation (float, optional): Given actuation. Defaults to None.
-        theta (float, optional): Given angle value. Defaults to None.
+        actuation (float, optional): Given actuation, scalar or array.
+        Defaults to None.
+        theta (float, optional): Given angle value, scalar or array.
+        Defaults to None.
         radians (bool, optional): Specifier if given or returned angle
         should be radian. Defaults to True.
 
     Raises:
         AttributeError: Raised if neither actuation or angle are given.
         AttributeError: Raised if both actuation and angle are given.
+        ValueError: Raised if values are outside of calibrated range.
 
     Returns:
         float: Returns either angle or actuation, depending on given
-        attributes.
+        attributes. Has the shape of the given argument.
     """
     if actuation is None and theta is None:
         raise AttributeError("No argument given!")
@@ -283,28 +433,12 @@ def f_theta(
     if actuation is not None and theta is not None:
         raise AttributeError("Only specify either actuation or angle!")
 
-    theta_pos = [6.40400874, 12.17836522, 19.90385964, 28.11300675, 37.14585762]
-    theta_pos_actuation = [i * 0.25 for i in range(5)]
-
-    output = None
-
     if theta is not None:
-        f = interpolate.interp1d(theta_pos, theta_pos_actuation)
-
         if radians:
-            theta = np.rad2deg(theta)
-
-        actuation = f(theta)
-
-        output = actuation
+            theta = theta * _RAD2DEG
 
-    if actuation is not None:
-        f = interpolate.interp1d(theta_pos_actuation, theta_pos)
-        theta_calc = f(actuation)
-
-        if radians:
-            theta_calc = np.radians(theta_calc)
+        return _interpolate(theta, _THETA_TO_ACTUATION)
 
-        output = theta_calc
+    theta_calc = _interpolate(actuation, _ACTUATION_TO_THETA)
 
-    return output
+    return np.radians(theta_calc) if radians else theta_calc
@@ -1,15 +1,12 @@
-import json
 import pathlib
 
 from aimy_target_shooting.ball_launcher_api import BallLauncherAPI
-from aimy_target_shooting.configuration import get_config_path
+from aimy_target_shooting.configuration import load_config
 from aimy_target_shooting.recording import Recording
 
 
 def launch():
-    path = get_config_path("launcher")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("launcher")
 
     launcher = BallLauncherAPI(config)
     launcher.set_rpm(0.5, 0.0, 0, 0, 0)
@@ -17,9 +14,7 @@ def launch():
 
 
 def launch_and_record():
-    path = get_config_path("launcher")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("launcher")
 
     launch_parameters = (0.5, 0.5, 800, 800, 1600)
 
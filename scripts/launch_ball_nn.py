@@ -1,11 +1,10 @@
-import json
 import logging
 import pathlib
 
 import numpy as np
 
 from aimy_target_shooting.ball_launcher_api import BallLauncherAPI
-from aimy_target_shooting.configuration import get_config_path
+from aimy_target_shooting.configuration import load_config
 from aimy_target_shooting.target_shooting_nn import TargetShootingNN
 
 
@@ -16,9 +15,7 @@ def train_target_shooting():
         "MN5008_grid_data_all.hdf5"
     )
 
-    path = get_config_path("learning")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("learning")
 
     nn = TargetShootingNN(config)
     nn.generate_dataset(filepath=file_path)
@@ -26,18 +23,17 @@ def train_target_shooting():
     nn.train_model()
 
     nn.export_model()
+    nn.export_model(save_format="keras")
     nn.export_scaling()
 
 
 def launch_ball_loaded_model():
-    path = get_config_path("launcher")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("launcher")
 
     launcher = BallLauncherAPI(config)
 
-    nn = TargetShootingNN()
-    nn.load_model(pathlib.Path("/tmp/nn_model/model.hdf5"))
+    nn = TargetShootingNN(load_config("learning"))
+    nn.load_model(pathlib.Path("/tmp/nn_model/model.keras"))
     nn.load_scaling()
 
     target_position = np.array((3.0, 1.0, 0.76))
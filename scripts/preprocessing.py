@@ -1,58 +1,103 @@
-import json
+import collections
 import pathlib
+import typing
+from concurrent.futures import ThreadPoolExecutor
 
-from aimy_target_shooting import export_tools, filtering, transform
-from aimy_target_shooting.configuration import get_config_path
-from aimy_target_shooting.custom_types import TransformTimeUnits
-
+import pandas as pd
 
-def preprocessing_dialog():
-    path = get_config_path("preprocessing")
-    with open(path, "r") as file:
-        config = json.load(file)
-
-    # Import-export options
-    directory_path = pathlib.Path(
-        "/home/adittrich/nextcloud/82_Data_Processed/MN5008_spin_validation"
-    )
+from aimy_target_shooting import export_tools, filtering, transform
+from aimy_target_shooting.configuration import load_config
+from aimy_target_shooting.custom_types import (
+    TrajectoryCollection,
+    TransformTimeUnits,
+)
 
-    file_name = "mn5008_no_spin.hdf5"
 
-    export_dir_path = pathlib.Path("/tmp/")
-    export_file_name = "mn5008_mixed_spin"
+def preprocess_batch(
+    data_raw: TrajectoryCollection,
+    config: dict,
+    lengths: typing.Optional[typing.Counter[str]] = None,
+) -> TrajectoryCollection:
+    if lengths is None:
+        lengths = collections.Counter()
 
-    # Load raw data
-    data_raw = export_tools.import_all_from_hdf5(file_path=directory_path / file_name)
-    print(f"Length raw: {len(data_raw)}")
+    lengths["raw"] += len(data_raw)
 
     # Trajectory Preprocessing
     data_real_processed = filtering.remove_short_trajectories(data_raw, config)
-    print(f"Length without empty: {len(data_real_processed)}")
+    lengths["without empty"] += len(data_real_processed)
 
-    # Transformation
+    # Transformation, filters return fresh copies, so the transforms can
+    # modify their intermediate results in place
     data_real_processed = transform.change_time_stamps(
-        data_real_processed, TransformTimeUnits.Seconds
+        data_real_processed, TransformTimeUnits.Seconds, inplace=True
+    )
+    data_real_processed = transform.move_origin(
+        data_real_processed, config, inplace=True
     )
-    data_real_processed = transform.move_origin(data_real_processed, config)
     # data_real_processed = transform.rotate_coordinate_system(data_real_processed)
-    data_real_processed = transform.reset_time_stamps(data_real_processed)
+    data_real_processed = transform.reset_time_stamps(data_real_processed, inplace=True)
 
     # Filtering
     data_region = filtering.filter_samples_outside_region(data_real_processed, config)
     data_region = data_real_processed
-    print(f"Length outside region: {len(data_region)}")
+    lengths["outside region"] += len(data_region)
 
     data_jumps = filtering.filter_noisy_samples(data_region, config)
     data_jumps = filtering.remove_short_trajectories(data_jumps, config)
-    data_jumps = transform.reset_time_stamps(data_jumps)
-    print(f"Length without jumps: {len(data_jumps)}")
+    data_jumps = transform.reset_time_stamps(data_jumps, inplace=True)
+    lengths["without jumps"] += len(data_jumps)
 
     data_patchy = filtering.remove_patchy_trajectories(data_jumps, config)
     data_patchy = filtering.remove_short_trajectories(data_patchy, config)
-    print(f"Length without patchy: {len(data_patchy)}")
+    lengths["without patchy"] += len(data_patchy)
 
     data_patchy = filtering.filter_samples_after_time_stamp(data_patchy, config)
-    print(f"Length after time filter: {len(data_patchy)}")
+    lengths["after time filter"] += len(data_patchy)
+
+    return data_patchy
+
+
+def preprocessing_dialog():
+    config = load_config("preprocessing")
+
+    # Import-export options
+    directory_path = pathlib.Path(
+        "/home/adittrich/nextcloud/82_Data_Processed/MN5008_spin_validation"
+    )
+
+    file_name = "mn5008_no_spin.hdf5"
+
+    export_dir_path = pathlib.Path("/tmp/")
+    export_file_name = "mn5008_mixed_spin"
+
+    # Load raw data batch-wise, the next batch is read while the current one
+    # is processed, so only a few batches are held in memory at once
+    batches = export_tools.iterate_batches_from_hdf5(
+        file_path=directory_path / file_name, batch_size=64
+    )
+
+    data_patchy = TrajectoryCollection()
+
+    # Lengths after each preprocessing stage summed over all batches
+    lengths = collections.Counter()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_batch = executor.submit(next, batches, None)
+
+        while True:
+            data_raw = next_batch.result()
+
+            if data_raw is None:
+                break
+
+            next_batch = executor.submit(next, batches, None)
+
+            for trajectory_data in preprocess_batch(data_raw, config, lengths):
+                data_patchy.append(trajectory_data)
+
+    for stage, length in lengths.items():
+        print(f"Length {stage}: {length}")
 
     # Hitpoint computation
     # detector = hitpoint_detection.HitPointDetection()
@@ -69,9 +114,16 @@ def preprocessing_dialog():
     # for idx in sorted([4,18,21], reverse=True):
     #    data_patchy.delete_item(idx)
 
-    for i in range(len(data_patchy)):
-        x = data_patchy.get_item(i)
-        print(f"{i}: {x.launch_param}")
+    launch_params = [trajectory_data.launch_param for trajectory_data in data_patchy]
+
+    # Manually recorded trajectories have no launch parameters, missing values
+    # are shown as NaN
+    if any(len(launch_param) for launch_param in launch_params):
+        names = ["phi", "theta", "omega_tl", "omega_tr", "omega_bc"]
+        launch_param_table = pd.DataFrame(launch_params).rename(
+            columns=dict(enumerate(names))
+        )
+        print(launch_param_table.to_string())
 
     print(f"Length after delete: {len(data_patchy)}")
     print("Export? [y/n]")
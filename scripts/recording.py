@@ -1,17 +1,14 @@
-import json
 import logging
 import pathlib
 
 import numpy as np
 
-from aimy_target_shooting.configuration import get_config_path
+from aimy_target_shooting.configuration import load_config
 from aimy_target_shooting.recording import Recording
 
 
 def grid_search() -> None:
-    path = get_config_path("recording")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("recording")
 
     phi_range = config["gridsearch_param"]["phi_range"]
     theta_range = config["gridsearch_param"]["theta_range"]
@@ -39,41 +36,42 @@ def grid_search() -> None:
     omega_tr_space = np.linspace(omega_tr_range[0], omega_tr_range[1], n_omega_tr_steps)
     omega_bc_space = np.linspace(omega_bc_range[0], omega_bc_range[1], n_omega_bc_steps)
 
-    number_balls = (
-        n_omega_bc_steps
-        * n_omega_tl_steps
-        * n_omega_tr_steps
-        * n_phi_steps
-        * n_theta_steps
+    # Actuation thresholds only depend on the omegas, hence valid omega
+    # combinations are determined once and shared by all angles.
+    omega_grid = np.stack(
+        np.meshgrid(omega_tl_space, omega_tr_space, omega_bc_space, indexing="ij"),
+        axis=-1,
+    ).reshape(-1, 3)
+
+    actuation_sum = omega_grid.sum(axis=1)
+    valid_omegas = omega_grid[
+        (actuation_lower_threshold <= actuation_sum)
+        & (actuation_sum <= actuation_upper_threshold)
+    ]
+
+    # Angles are ordered phi, theta, where theta changes slowest during shots.
+    angle_grid = np.stack(
+        np.meshgrid(theta_space, phi_space, indexing="ij"), axis=-1
+    ).reshape(-1, 2)[:, ::-1]
+
+    launch_grid = np.concatenate(
+        (
+            np.repeat(angle_grid, len(valid_omegas), axis=0),
+            np.tile(valid_omegas, (len(angle_grid), 1)),
+        ),
+        axis=1,
     )
-    logging.debug(f"{number_balls} to be shot")
-
-    counter = 0
-
-    for theta in np.nditer(theta_space):
-        for phi in np.nditer(phi_space):
-            for omega_tl in np.nditer(omega_tl_space):
-                for omega_tr in np.nditer(omega_tr_space):
-                    for omega_bc in np.nditer(omega_bc_space):
-                        if (
-                            actuation_lower_threshold > (omega_tl + omega_tr + omega_bc)
-                            or (omega_tl + omega_tr + omega_bc)
-                            > actuation_upper_threshold
-                        ):
-                            continue
-
-                        launch_parameters = (
-                            phi,
-                            theta,
-                            omega_tl,
-                            omega_tr,
-                            omega_bc,
-                        )
-                        env.set_launch_parameters(launch_parameters)
-                        env.record_and_launch()
-
-                        counter += 1
-                        logging.info(f"Shot No. {counter} fired.")
+
+    logging.debug(
+        f"{len(launch_grid)} of {len(angle_grid) * len(omega_grid)} "
+        "grid points to be shot"
+    )
+
+    for counter, launch_parameters in enumerate(launch_grid, start=1):
+        env.set_launch_parameters(tuple(launch_parameters))
+        env.record_and_launch()
+
+        logging.info(f"Shot No. {counter} fired.")
 
     env.export_recordings(prefix=prefix, path=dir_path, export_format="hdf5")
     env.export_recordings(prefix=prefix, path=dir_path, export_format="csv")
@@ -82,9 +80,7 @@ def grid_search() -> None:
 
 
 def run_single_measurement() -> None:
-    path = get_config_path("recording")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("recording")
 
     dir_path = pathlib.Path(config["recording_param"]["save_path"])
     logging.info(f"Saving path: {dir_path}")
@@ -110,9 +106,7 @@ def run_single_measurement() -> None:
 
 
 def run_multiple_measurements() -> None:
-    path = get_config_path("recording")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("recording")
 
     dir_path = pathlib.Path(config["recording_param"]["save_path"])
     logging.info(f"Saving path: {dir_path}")
@@ -146,9 +140,7 @@ def run_multiple_measurements() -> None:
 
 
 def manual_recording():
-    path = get_config_path("recording")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("recording")
 
     dir_path = pathlib.Path(config["recording_param"]["save_path"])
     prefix = config["recording_param"]["prefix"]
@@ -1,13 +1,9 @@
-import json
-
-from aimy_target_shooting.configuration import get_config_path
+from aimy_target_shooting.configuration import load_config
 from aimy_target_shooting.control_panel import run_control_panel
 
 
 def run():
-    path = get_config_path("recording")
-    with open(path, "r") as file:
-        config = json.load(file)
+    config = load_config("recording")
 
     demo_mode = False
     verbose = True
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from aimy_target_shooting.custom_types import TrajectoryCollection, TrajectoryData
+
+
+@pytest.fixture(scope="session")
+def trajectory_collection() -> TrajectoryCollection:
+    """Trajectories with launch parameters, random positions and velocities.
+    Shared by all tests, hence tests must not modify the collection.
+    """
+    n_datasets: int = 5
+    sample_size: int = 200
+
+    collection = TrajectoryCollection()
+    rng = np.random.default_rng(0)
+
+    # Time stamps relative to the first sample, as stored by append_sample
+    time_stamps = np.arange(sample_size) * 0.001
+
+    for _ in range(n_datasets):
+        launch_parameters = [1.0, 0.99, 0.4, 0.4, 0.4]
+        samples = rng.random((sample_size, 6))
+
+        trajectory_data = TrajectoryData()
+        trajectory_data.set_full_trajectory(
+            time_stamps,
+            samples[:, :3],
+            velocities=samples[:, 3:],
+            launch_parameters=launch_parameters,
+        )
+
+        collection.append(trajectory_data)
+
+    return collection
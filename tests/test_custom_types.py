@@ -1,6 +1,8 @@
+import copy
 import random
 
 import numpy as np
+import pytest
 
 from aimy_target_shooting.custom_types import TrajectoryCollection, TrajectoryData
 
@@ -32,10 +34,18 @@ def test_get_item():
     item_0_fetched = collection.get_item(0)
     assert type(item_0) == type(item_0_fetched)
     assert item_0 == item_0_fetched
+    assert item_0_fetched is item_0
 
     # Check whether trajectory can be copied
     collection_copy = collection.deepcopy()
-    assert collection_copy.get_item(0).time_stamps == collection.get_item(0).time_stamps
+    assert collection_copy.get_item(0) is not item_0
+    assert not np.shares_memory(
+        collection_copy.get_item(0).time_stamps, item_0.time_stamps
+    )
+
+    np.testing.assert_array_equal(
+        collection_copy.get_item(0).time_stamps, collection.get_item(0).time_stamps
+    )
 
 
 def test_slicing_collection():
@@ -56,6 +66,7 @@ def test_appending_samples():
     n_samples = 200
 
     collection = TrajectoryCollection()
+    rng = np.random.default_rng()
 
     for _ in range(n_datasets):
         launch_parameter = [0.5, 0.5, 0.3, 0.2, 0.1]
@@ -63,13 +74,58 @@ def test_appending_samples():
 
         trajectory_data.set_launch_param(launch_parameter)
 
-        # append iteratively samples
-        for i in range(n_samples):
+        # append iteratively samples, arrays are accepted as sample values
+        for i, sample in enumerate(rng.random((n_samples, 6))):
             ball_id = i
             time_stamp = i * 0.001
-            position = [np.random.random_sample() for _ in range(3)]
-            velocity = [np.random.random_sample() for _ in range(3)]
+            position = sample[:3]
+            velocity = sample[3:]
 
             trajectory_data.append_sample(ball_id, time_stamp, position, velocity)
 
+        assert trajectory_data.time_stamps.shape == (n_samples,)
+        assert trajectory_data.positions.shape == (n_samples, 3)
+        assert trajectory_data.velocities.shape == (n_samples, 3)
+
+        # Samples are views of one contiguous buffer, not copies per access
+        assert trajectory_data.positions.flags.c_contiguous
+        assert np.shares_memory(trajectory_data.positions, trajectory_data.positions)
+
         collection.append(trajectory_data)
+
+
+def test_shallow_copy_samples():
+    trajectory_data = TrajectoryData()
+
+    for i in range(10):
+        trajectory_data.append_sample(1, float(i), (i, i, i), (1.0, 1.0, 1.0))
+
+    trajectory_data_copy = copy.copy(trajectory_data)
+    assert np.shares_memory(trajectory_data_copy.positions, trajectory_data.positions)
+
+    trajectory_data_copy.append_sample(1, 10.0, (0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+    trajectory_data.append_sample(1, 10.0, (5.0, 5.0, 5.0), (1.0, 1.0, 1.0))
+
+    assert len(trajectory_data) == len(trajectory_data_copy) == 11
+    np.testing.assert_array_equal(trajectory_data_copy.positions[-1], (0.0, 0.0, 0.0))
+    np.testing.assert_array_equal(trajectory_data.positions[-1], (5.0, 5.0, 5.0))
+
+
+def test_setting_samples_checks_shape():
+    trajectory_data = TrajectoryData()
+
+    trajectory_data.positions = [(0.0, 1.0, 2.0), (3.0, 4.0, 5.0)]
+    assert trajectory_data.positions.shape == (2, 3)
+
+    # empty lists reset samples
+    trajectory_data.positions = []
+    assert trajectory_data.positions.shape == (0, 3)
+
+    with pytest.raises(ValueError):
+        trajectory_data.positions = np.zeros((4, 2))
+
+    with pytest.raises(ValueError):
+        trajectory_data.positions = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+
+    with pytest.raises(ValueError):
+        trajectory_data.time_stamps = 1.0
@@ -1,4 +1,3 @@
-import pathlib
 import random
 
 import numpy as np
@@ -6,7 +5,7 @@ import numpy as np
 from aimy_target_shooting.data_scaler import DataScaler
 
 
-def test_scaler_export():
+def test_scaler_export(tmp_path):
     bias = []
     scaling = []
 
@@ -17,18 +16,17 @@ def test_scaler_export():
     scaler = DataScaler(
         scaling_method="standard", bias_value=bias, scaling_value=scaling
     )
-    tmp_path = pathlib.Path("/tmp/test_scaling.json")
-    scaler.export_values(tmp_path)
+    scaler.export_values(tmp_path / "test_scaling.json")
 
     # Generate new scaler with old scaler parameters from JSON
     new_scaler = DataScaler("standard")
-    new_scaler.import_values(tmp_path)
+    new_scaler.import_values(tmp_path / "test_scaling.json")
 
     assert (new_scaler.bias_value == np.array(bias)).all()
     assert (new_scaler.scaling_value == np.array(scaling)).all()
 
 
-def test_scaler():
+def test_scaler(tmp_path):
     test_data = np.random.randn(230, 4)
 
     scaler = DataScaler(scaling_method="minmax")
@@ -39,5 +37,16 @@ def test_scaler():
 
     assert (scaler.bias_value == np.min(test_data, axis=0)).all()
 
-    tmp_path = pathlib.Path("/tmp/test_scaling.json")
-    scaler.export_values(tmp_path)
+    scaler.export_values(tmp_path / "test_scaling.json")
+
+
+def test_scaler_batch():
+    test_data = np.random.randn(230, 4)
+
+    scaler = DataScaler(scaling_method="standard")
+    scaled_data = scaler.set_and_scale(test_data)
+
+    scaled_samples = np.array([scaler.only_scale(sample) for sample in test_data])
+
+    np.testing.assert_allclose(scaler.only_scale(test_data), scaled_samples)
+    np.testing.assert_allclose(scaler.unscale(scaled_data), test_data)
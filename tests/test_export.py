@@ -1,152 +1,145 @@
-import datetime
-import pathlib
-
+import h5py
 import numpy as np
+import pandas as pd
+import pytest
 
 from aimy_target_shooting import export_tools
-from aimy_target_shooting.custom_types import TrajectoryCollection, TrajectoryData
-
-
-def generate_test_collection() -> TrajectoryCollection:
-    n_datasets: int = 5
-    sample_size: int = 200
-
-    collection = TrajectoryCollection()
-
-    for i in range(n_datasets):
-        launch_parameters = [1.0, 0.99, 0.4, 0.4, 0.4]
-
-        trajectory_data = TrajectoryData()
-        trajectory_data.set_launch_param(launch_parameters)
-
-        for i in range(sample_size):
-            ball_id = 1
-            time_stamp = (i + 5) * 0.001
-            trajectory = tuple([np.random.random_sample() for _ in range(3)])
-            velocity = tuple([np.random.random_sample() for _ in range(3)])
-
-            trajectory_data.append_sample(ball_id, time_stamp, trajectory, velocity)
-
-        collection.append(trajectory_data)
 
-    return collection
 
+@pytest.mark.parametrize("import_all", [False, True])
+def test_export_dataset_to_csv(trajectory_collection, tmp_path, import_all):
+    # Export collection
+    export_tools.export_to_csv(trajectory_collection, tmp_path, prefix="test")
 
-def test_export_single_dataset_to_csv():
-    # Generate test data
-    collection = generate_test_collection()
+    # Import collection
+    if import_all:
+        # Files without matching prefix are ignored
+        (tmp_path / "other.csv").write_text("")
 
-    # Export collection
-    now = datetime.datetime.now()
-    time_stamp = now.strftime("%Y%m%d%H%M%S")
+        collection_imported = export_tools.import_all_from_csv(
+            directory_path=tmp_path, prefix="test"
+        )
 
-    dir_name = "/tmp/testing/" + str(time_stamp) + "_single_csv"
-    tmp_path = pathlib.Path(dir_name)
-    prefix = "test"
+        assert len(collection_imported) == len(trajectory_collection)
+        data_imported = collection_imported.get_item(1)
+    else:
+        data_imported = export_tools.import_from_csv(file_path=tmp_path / "test1.csv")
 
-    export_tools.export_to_csv(collection, tmp_path, prefix)
+    # Test
+    data_reference = trajectory_collection.get_item(1)
 
-    # Import collection
-    file_name = prefix + "1.csv"
-    file_path = tmp_path / file_name
+    assert data_imported.launch_param == tuple(data_reference.launch_param)
 
-    data_imported = export_tools.import_from_csv(
-        file_path=file_path,
-        import_launch_param=True,
-        import_velocities=True,
+    np.testing.assert_allclose(
+        data_reference.positions, data_imported.positions, rtol=0, atol=1e-7
+    )
+    np.testing.assert_allclose(
+        data_reference.velocities, data_imported.velocities, rtol=0, atol=1e-7
     )
 
-    # Test
-    data_reference = collection.get_item(1)
 
-    np.testing.assert_almost_equal(data_reference.positions, data_imported.positions)
+def test_import_legacy_csv(trajectory_collection, tmp_path):
+    data_reference = trajectory_collection.get_item(1)
+    positions = data_reference.positions
+    velocities = data_reference.velocities
+
+    # Layout written by earlier versions via pandas
+    launch_param = list(data_reference.launch_param)
+    launch_param.extend([""] * (len(positions) - len(launch_param)))
+
+    df = pd.DataFrame(
+        {
+            "launch_param": launch_param,
+            "time_stamps": data_reference.time_stamps,
+            "x": positions[:, 0],
+            "y": positions[:, 1],
+            "z": positions[:, 2],
+            "vx": velocities[:, 0],
+            "vy": velocities[:, 1],
+            "vz": velocities[:, 2],
+        }
+    )
+    df.to_csv(tmp_path / "legacy.csv")
 
+    data_imported = export_tools.import_from_csv(file_path=tmp_path / "legacy.csv")
 
-def test_export_dataset_to_csv():
-    # Generate test data
-    collection = generate_test_collection()
+    assert data_imported.launch_param == tuple(data_reference.launch_param)
+    np.testing.assert_allclose(positions, data_imported.positions, rtol=0, atol=1e-7)
+    np.testing.assert_allclose(velocities, data_imported.velocities, rtol=0, atol=1e-7)
 
-    # Export collection
-    now = datetime.datetime.now()
-    time_stamp = now.strftime("%Y%m%d%H%M%S")
 
-    dir_name = "/tmp/testing/" + str(time_stamp) + "_csv"
-    tmp_path = pathlib.Path(dir_name)
-    prefix = "test"
+@pytest.mark.parametrize("import_all", [False, True])
+def test_export_dataset_to_hdf5(trajectory_collection, import_all):
+    # In-memory file, nothing is written to disk
+    with h5py.File("test.hdf5", "w", driver="core", backing_store=False) as hdf5_file:
+        # Export collection
+        export_tools.export_to_hdf5(trajectory_collection, hdf5_file=hdf5_file)
 
-    export_tools.export_to_csv(collection, tmp_path, prefix)
-
-    # Import collection
-    collection_imported = export_tools.import_all_from_csv(
-        directory_path=tmp_path,
-        import_launch_param=True,
-        import_velocities=True,
-    )
+        # Import collection
+        if import_all:
+            data_imported = export_tools.import_all_from_hdf5(
+                hdf5_file=hdf5_file
+            ).get_item(1)
+        else:
+            data_imported = export_tools.import_from_hdf5(1, hdf5_file=hdf5_file)
 
     # Test
-    data_reference = collection.get_item(1)
-    data_imported = collection_imported.get_item(1)
-
-    np.testing.assert_almost_equal(data_reference.positions, data_imported.positions)
+    data_reference = trajectory_collection.get_item(1)
 
+    np.testing.assert_allclose(
+        data_reference.positions, data_imported.positions, rtol=0, atol=1e-7
+    )
+    np.testing.assert_allclose(
+        data_reference.velocities, data_imported.velocities, rtol=0, atol=1e-7
+    )
 
-def test_export_single_dataset_to_hdf5():
-    # Generate test data
-    collection = generate_test_collection()
 
+def test_import_batches_from_hdf5(trajectory_collection, tmp_path):
     # Export collection
-    now = datetime.datetime.now()
-    time_stamp = now.strftime("%Y%m%d%H%M%S")
-    dir_name = "/tmp/testing/" + str(time_stamp) + "_single_hdf5"
-    tmp_path = pathlib.Path(dir_name)
-    hdf5_file_name = "ball_trajectories_" + str(np.random.randint(0, 1000))
+    hdf5_file_name = "ball_trajectories"
     hdf5_file_path = tmp_path / (hdf5_file_name + ".hdf5")
 
-    # Test export and import to hdf5 format
     export_tools.export_to_hdf5(
-        trajectory_collection=collection, directory_path=tmp_path, prefix=hdf5_file_name
+        trajectory_collection=trajectory_collection,
+        directory_path=tmp_path,
+        prefix=hdf5_file_name,
     )
 
-    data_imported = export_tools.import_from_hdf5(
-        group="originals",
-        index=0,
-        file_path=hdf5_file_path,
-        import_launch_param=True,
-        import_velocities=True,
+    batches = list(
+        export_tools.iterate_batches_from_hdf5(
+            file_path=hdf5_file_path,
+            batch_size=2,
+            import_launch_param=False,
+            import_velocities=False,
+        )
     )
 
-    data_reference = collection.get_item(0)
-
     # Test
-    np.testing.assert_almost_equal(data_reference.positions, data_imported.positions)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
 
+    for index, data_imported in enumerate(data for batch in batches for data in batch):
+        data_reference = trajectory_collection.get_item(index)
+        np.testing.assert_allclose(
+            data_reference.positions, data_imported.positions, rtol=0, atol=1e-7
+        )
 
-def test_export_dataset_to_hdf5():
-    # Generate test data
-    collection = generate_test_collection()
 
-    # Export collection
-    now = datetime.datetime.now()
-    time_stamp = now.strftime("%Y%m%d%H%M%S")
-    dir_name = "/tmp/testing/" + str(time_stamp) + "_hdf5"
-    tmp_path = pathlib.Path(dir_name)
-    hdf5_file_name = "ball_trajectories_" + str(np.random.randint(0, 1000))
-    hdf5_file_path = tmp_path / (hdf5_file_name + ".hdf5")
-
-    # Test export and import to hdf5 format
-    export_tools.export_to_hdf5(
-        trajectory_collection=collection, directory_path=tmp_path, prefix=hdf5_file_name
-    )
+def test_import_batches_from_opened_hdf5(trajectory_collection):
+    # In-memory file, nothing is written to disk
+    with h5py.File("test.hdf5", "w", driver="core", backing_store=False) as hdf5_file:
+        export_tools.export_to_hdf5(trajectory_collection, hdf5_file=hdf5_file)
 
-    collection_imported = export_tools.import_all_from_hdf5(
-        group="originals",
-        file_path=hdf5_file_path,
-        import_launch_param=True,
-        import_velocities=True,
-    )
+        batches = list(
+            export_tools.iterate_batches_from_hdf5(batch_size=3, hdf5_file=hdf5_file)
+        )
 
-    data_reference = collection.get_item(1)
-    data_imported = collection_imported.get_item(1)
+        # Given file is not closed by the iterator
+        assert hdf5_file.id.valid
 
-    # Test
-    np.testing.assert_almost_equal(data_reference.positions, data_imported.positions)
+    assert [len(batch) for batch in batches] == [3, 2]
+    np.testing.assert_allclose(
+        trajectory_collection.get_item(4).positions,
+        batches[1].get_item(1).positions,
+        rtol=0,
+        atol=1e-7,
+    )
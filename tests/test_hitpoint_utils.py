@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from aimy_target_shooting import hitpoint_utils
+from aimy_target_shooting.custom_types import TrajectoryCollection, TrajectoryData
+
+
+def generate_hitpoint_collection() -> TrajectoryCollection:
+    hitpoint_lists = [
+        [(1.0, 0.0, 0.76), (1.05, 0.0, 0.76), (2.0, 0.1, 0.76)],
+        [],
+        [(1.5, -0.1, 0.76)],
+        [],
+    ]
+
+    collection = TrajectoryCollection()
+
+    for hitpoints in hitpoint_lists:
+        trajectory_data = TrajectoryData()
+        trajectory_data["hitpoints"] = hitpoints
+        trajectory_data["hitpoint_time_stamps"] = [
+            0.1 * i for i in range(len(hitpoints))
+        ]
+        collection.append(trajectory_data)
+
+    return collection
+
+
+def test_remove_trajectories_without_hitpoints():
+    collection = generate_hitpoint_collection()
+
+    filtered_collection = hitpoint_utils.remove_trajectories_without_hitpoints(
+        collection
+    )
+
+    assert len(filtered_collection) == 2
+    assert len(collection) == 4
+    assert filtered_collection.get_item(1).hitpoints == [(1.5, -0.1, 0.76)]
+
+    collection.append(TrajectoryData())
+
+    with pytest.raises(ValueError):
+        hitpoint_utils.remove_trajectories_without_hitpoints(collection)
+
+
+def test_trajectories_without_hitpoints():
+    collection = generate_hitpoint_collection()
+
+    assert hitpoint_utils.count_trajectories_without_hitpoints(collection) == 2
+    assert hitpoint_utils.any_trajectory_without_hitpoints(collection)
+
+    filtered_collection = hitpoint_utils.remove_trajectories_without_hitpoints(
+        collection
+    )
+
+    assert hitpoint_utils.count_trajectories_without_hitpoints(filtered_collection) == 0
+    assert not hitpoint_utils.any_trajectory_without_hitpoints(filtered_collection)
+
+
+def test_remove_further_hitpoints_inplace():
+    collection = generate_hitpoint_collection()
+
+    copied_collection = hitpoint_utils.remove_further_hitpoints(collection)
+
+    assert len(collection.get_item(0).hitpoints) == 3
+    assert len(copied_collection.get_item(0).hitpoints) == 1
+
+    modified_collection = hitpoint_utils.remove_further_hitpoints(
+        collection, inplace=True
+    )
+
+    assert modified_collection is collection
+    assert len(collection.get_item(0).hitpoints) == 1
+    assert len(collection.get_item(0).hitpoint_time_stamps) == 1
+
+
+def test_average_close_hitpoints():
+    collection = generate_hitpoint_collection()
+
+    averaged_collection = hitpoint_utils.average_close_hitpoints(
+        collection, tolerated_euclidian_distance=0.1
+    )
+
+    hitpoints = averaged_collection.get_item(0).hitpoints
+
+    assert len(hitpoints) == 2
+    np.testing.assert_allclose(hitpoints[0], (1.025, 0.0, 0.76))
+    np.testing.assert_allclose(hitpoints[1], (2.0, 0.1, 0.76))
+    np.testing.assert_allclose(
+        averaged_collection.get_item(2).hitpoints[0], (1.5, -0.1, 0.76)
+    )
@@ -0,0 +1,69 @@
+import numpy as np
+
+from aimy_target_shooting.custom_types import TrajectoryData
+from aimy_target_shooting.learning_utils import (
+    create_targets_batch,
+    extract_all_velocities,
+    extract_velocities,
+)
+from aimy_target_shooting.utility import cartesian_to_polar
+
+
+def test_extract_all_velocities():
+    fitting_window = 5
+    sample_size = 60
+
+    time_stamps = np.cumsum(np.random.uniform(0.004, 0.006, sample_size))
+    positions = np.random.random_sample((sample_size, 3))
+
+    trajectory_data = TrajectoryData()
+    trajectory_data.set_full_trajectory(list(time_stamps), positions)
+
+    velocities = extract_all_velocities(trajectory_data, fitting_window)
+
+    assert velocities.shape == (sample_size - fitting_window + 1, 3)
+
+    for idx in range(fitting_window, sample_size):
+        np.testing.assert_allclose(
+            velocities[idx - fitting_window],
+            extract_velocities(trajectory_data, idx, fitting_window),
+        )
+
+
+def test_create_targets_batch():
+    targets = ["p_x", "p_y", "p_z", "v_x", "v_y", "v_z", "alpha", "beta", "v_mag"]
+    config = {"dataset_generation": {target: True for target in targets}}
+    config["dataset_generation"]["polar_transform"] = True
+
+    positions = np.random.random_sample((20, 3)) + 0.1
+    velocities = np.random.random_sample((20, 3)) + 0.1
+
+    trg_params = create_targets_batch(positions, velocities, config)
+
+    assert trg_params.shape == (20, len(targets))
+
+    for sample, position, velocity in zip(trg_params, positions, velocities):
+        _, alpha, beta = cartesian_to_polar(*velocity)
+        reference = [
+            *cartesian_to_polar(*position),
+            *velocity,
+            alpha,
+            beta,
+            np.linalg.norm(velocity),
+        ]
+
+        np.testing.assert_allclose(sample, reference)
+
+
+def test_create_targets_batch_negative_x():
+    targets = ["p_x", "p_y", "p_z", "v_x", "v_y", "v_z", "alpha", "beta", "v_mag"]
+    config = {target: False for target in targets}
+    config.update({"alpha": True, "polar_transform": False})
+
+    velocities = np.array([[-1.0, 1.0, 0.0], [-1.0, -1.0, 0.0]])
+
+    alpha = create_targets_batch(
+        np.ones((2, 3)), velocities, {"dataset_generation": config}
+    )
+
+    np.testing.assert_allclose(alpha[:, 0], [0.75 * np.pi, -0.75 * np.pi])
@@ -0,0 +1,65 @@
+import h5py
+
+from aimy_target_shooting.recording import Recording
+
+
+class StubObservation:
+    def __init__(self, iteration: int) -> None:
+        self.iteration = iteration
+
+    def get_iteration(self) -> int:
+        return self.iteration
+
+    def get_ball_id(self) -> int:
+        return self.iteration
+
+    def get_time_stamp(self) -> float:
+        return self.iteration * 1e6
+
+    def get_position(self) -> tuple:
+        return (0.0, 0.0, 1.0)
+
+    def get_velocity(self) -> tuple:
+        return (1.0, 0.0, 0.0)
+
+
+class StubFrontend:
+    def latest(self) -> StubObservation:
+        return StubObservation(0)
+
+    def read(self, iteration: int) -> StubObservation:
+        return StubObservation(iteration)
+
+
+class StubLauncher:
+    def set_rpm(self, *launch_parameters) -> None:
+        pass
+
+    def launch(self) -> None:
+        pass
+
+
+def test_incremental_export(tmp_path):
+    config = {
+        "recording_param": {
+            "recording_duration": 0.01,
+            "tennicam_segment_id": "tennicam_client",
+        }
+    }
+
+    # Path given as str, e.g. from command line
+    recording = Recording(config, incremental_export_path=str(tmp_path))
+    recording._frontend = StubFrontend()
+    recording.launcher = StubLauncher()
+    recording.set_launch_parameters((0.5, 0.5, 1000.0, 1000.0, 1000.0))
+
+    for _ in range(3):
+        recording.record_and_launch()
+
+    assert recording.n_exported_trajectories == 3
+    assert not recording.trajectory_collection
+
+    file_path = tmp_path / (recording.incremental_prefix + ".hdf5")
+
+    with h5py.File(file_path, "r") as file:
+        assert len(file["originals"]) == 3
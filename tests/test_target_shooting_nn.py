@@ -0,0 +1,171 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from aimy_target_shooting.data_scaler import DataScaler  # noqa: E402
+from aimy_target_shooting.target_shooting_nn import (  # noqa: E402
+    TargetShootingNN,
+    _cached_load_model,
+    _load_scaler,
+)
+
+
+def generate_nn(jit_compile: bool = True) -> TargetShootingNN:
+    nn = TargetShootingNN({}, verbose=False, jit_compile=jit_compile)
+
+    nn.input_shape = 3
+    nn.output_shape = 5
+    nn.generate_MLP_model(
+        n_layers=2,
+        n_neurons=[8, 8],
+        dropout=0.0,
+        precision_policy="float32",
+        activation="relu",
+    )
+
+    rng = np.random.default_rng(0)
+    nn.target_scaler = DataScaler()
+    nn.target_scaler.set_and_scale(rng.uniform(0.0, 4.0, (50, 3)))
+    nn.control_scaler = DataScaler()
+    nn.control_scaler.set_and_scale(rng.uniform(0.0, 1.0, (50, 5)))
+
+    return nn
+
+
+@pytest.mark.parametrize("jit_compile", [True, False])
+def test_fused_inference(jit_compile):
+    nn = generate_nn(jit_compile)
+    target = np.array([2.5, 0.5, 0.7])
+
+    control_parameters = nn.compute_control_parameters(target)
+
+    reference = nn.control_scaler.unscale(
+        nn.model.predict(nn.target_scaler.only_scale(target[None]), verbose=0)
+    )[0]
+
+    assert control_parameters.dtype == np.float64
+    np.testing.assert_allclose(control_parameters, reference, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 8, 13])
+def test_batch_inference(batch_size):
+    nn = generate_nn()
+    targets = np.random.default_rng(1).uniform(0.0, 4.0, (batch_size, 3))
+
+    control_parameters = nn.compute_control_parameters_batch(targets)
+
+    # batch sizes, which are no multiple of the padded layer width, must not
+    # add or drop rows
+    assert control_parameters.shape == (batch_size, 5)
+
+    for target, control_parameter in zip(targets, control_parameters):
+        np.testing.assert_allclose(
+            control_parameter,
+            nn.compute_control_parameters(target),
+            rtol=1e-5,
+            atol=1e-6,
+        )
+
+
+def test_model_cache(tmp_path):
+    model_path = tmp_path / "model.keras"
+    target = np.array([2.5, 0.5, 0.7])
+
+    nn = generate_nn()
+    nn.export_model(model_path, save_format="keras")
+
+    _cached_load_model.cache_clear()
+    nn_a = generate_nn()
+    nn_a.load_model(model_path)
+    nn_b = generate_nn()
+    nn_b.load_model(model_path)
+
+    assert _cached_load_model.cache_info().misses == 1
+    assert _cached_load_model.cache_info().hits == 1
+
+    # instances get their own copy of the cached model
+    reference = nn_b.compute_control_parameters(target)
+    nn_a.model.set_weights([w * 0.0 for w in nn_a.model.get_weights()])
+
+    np.testing.assert_allclose(nn_b.compute_control_parameters(target), reference)
+    np.testing.assert_allclose(
+        nn_a.model.predict(target[None], verbose=0), 0.0, atol=1e-12
+    )
+
+    # rewriting the file invalidates the cache, mtime is advanced explicitly for
+    # file systems with coarse time stamps
+    nn.model.set_weights([w + 1.0 for w in nn.model.get_weights()])
+    nn.export_model(model_path, save_format="keras")
+    mtime_ns = model_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(model_path, ns=(mtime_ns, mtime_ns))
+
+    nn_c = generate_nn()
+    nn_c.load_model(model_path)
+
+    assert _cached_load_model.cache_info().misses == 2
+    np.testing.assert_allclose(
+        nn_c.compute_control_parameters(target),
+        nn.compute_control_parameters(target),
+        rtol=1e-5,
+    )
+
+
+def test_scaler_cache(tmp_path):
+    scaler_path = tmp_path / "scaler.json"
+    DataScaler(bias_value=[1.0, 2.0], scaling_value=[3.0, 4.0]).export_values(
+        scaler_path
+    )
+
+    scaler_a = _load_scaler(scaler_path)
+    scaler_a.bias_value[:] = 0.0
+
+    # instances get their own copy of the cached scaler
+    np.testing.assert_array_equal(_load_scaler(scaler_path).bias_value, [1.0, 2.0])
+
+    # rewriting the file invalidates the cache
+    DataScaler(bias_value=[5.0, 6.0], scaling_value=[3.0, 4.0]).export_values(
+        scaler_path
+    )
+    mtime_ns = scaler_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(scaler_path, ns=(mtime_ns, mtime_ns))
+
+    np.testing.assert_array_equal(_load_scaler(scaler_path).bias_value, [5.0, 6.0])
+
+
+@pytest.mark.parametrize(
+    "n_samples, validation_split, n_validation",
+    [(10, 0.3, 3), (11, 0.2, 3), (50, 0.25, 13), (20, 0.0, 0)],
+)
+def test_dataset_split(n_samples, validation_split, n_validation):
+    nn = generate_nn()
+    nn.target_variables_norm = np.arange(n_samples * 3, dtype=np.float32).reshape(-1, 3)
+    nn.control_parameters_norm = np.zeros((n_samples, 5), dtype=np.float32)
+
+    training_data, validation_data = nn._generate_datasets(4, validation_split)
+
+    training_samples = np.concatenate([x.numpy() for x, _ in training_data])
+
+    if n_validation == 0:
+        assert validation_data is None
+        validation_samples = np.empty((0, 3))
+    else:
+        validation_samples = np.concatenate([x.numpy() for x, _ in validation_data])
+
+    assert len(training_samples) == n_samples - n_validation
+    assert len(validation_samples) == n_validation
+
+    # as validation_split in Keras, the last samples are used for validation
+    np.testing.assert_array_equal(
+        validation_samples, nn.target_variables_norm[n_samples - n_validation :]
+    )
+    assert not set(training_samples[:, 0]) & set(validation_samples[:, 0])
+
+
+def test_export_aot_without_saved_model_cli(tmp_path, monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda name: None)
+
+    with pytest.raises(RuntimeError):
+        generate_nn().export_aot(str(tmp_path))
@@ -0,0 +1,110 @@
+import numpy as np
+
+from aimy_target_shooting import transform
+from aimy_target_shooting.custom_types import (
+    TrajectoryCollection,
+    TrajectoryData,
+    TransformTimeUnits,
+)
+
+
+def generate_test_collection() -> TrajectoryCollection:
+    n_datasets: int = 3
+    sample_size: int = 50
+
+    collection = TrajectoryCollection()
+    rng = np.random.default_rng(0)
+
+    for _ in range(n_datasets):
+        trajectory_data = TrajectoryData()
+
+        for i in range(sample_size):
+            time_stamp = (i + 5) * 1e6
+            position = tuple(rng.random(3))
+            velocity = tuple(rng.random(3))
+
+            trajectory_data.append_sample(1, time_stamp, position, velocity)
+
+        collection.append(trajectory_data)
+
+    return collection
+
+
+def test_rotate_coordinate_system():
+    collection = generate_test_collection()
+    config = {"coordinate_rotation": {"rotation_z_deg": 90.0}}
+
+    rotated_collection = transform.rotate_coordinate_system(collection, config)
+
+    for reference, rotated in zip(collection, rotated_collection):
+        positions = np.array(reference.positions)
+        velocities = np.array(reference.velocities)
+
+        expected_positions = np.stack(
+            (-positions[:, 1], positions[:, 0], positions[:, 2]), axis=1
+        )
+        expected_velocities = np.stack(
+            (-velocities[:, 1], velocities[:, 0], velocities[:, 2]), axis=1
+        )
+
+        np.testing.assert_allclose(rotated.positions, expected_positions, atol=1e-12)
+        np.testing.assert_allclose(rotated.velocities, expected_velocities, atol=1e-12)
+
+
+def test_move_origin():
+    collection = generate_test_collection()
+    config = {
+        "remove_bias": {"position_bias": [0.5, -1.0, 2.0], "first_point_reference": 0}
+    }
+
+    moved_collection = transform.move_origin(collection, config)
+
+    for reference, moved in zip(collection, moved_collection):
+        np.testing.assert_allclose(
+            moved.positions, np.array(reference.positions) - [0.5, -1.0, 2.0]
+        )
+
+    config["remove_bias"]["first_point_reference"] = 1
+    moved_collection = transform.move_origin(collection, config)
+
+    for reference, moved in zip(collection, moved_collection):
+        first_points = np.mean(reference.positions[0:3], axis=0)
+        np.testing.assert_allclose(
+            moved.positions, np.array(reference.positions) - first_points
+        )
+
+
+def test_time_stamps():
+    collection = generate_test_collection()
+
+    collection_seconds = transform.change_time_stamps(
+        collection, TransformTimeUnits.Seconds
+    )
+    collection_reset = transform.reset_time_stamps(collection_seconds)
+
+    for reference, transformed in zip(collection, collection_reset):
+        time_stamps = np.array(reference.time_stamps) * 1e-9
+
+        np.testing.assert_allclose(
+            transformed.time_stamps, time_stamps - time_stamps[0], atol=1e-15
+        )
+
+
+def test_transform_inplace():
+    collection = generate_test_collection()
+    reference_time_stamps = collection.get_item(0).time_stamps.copy()
+
+    reset_collection = transform.reset_time_stamps(collection)
+
+    assert reset_collection.get_item(0) is not collection.get_item(0)
+    np.testing.assert_array_equal(
+        collection.get_item(0).time_stamps, reference_time_stamps
+    )
+    assert np.shares_memory(
+        reset_collection.get_item(0).positions, collection.get_item(0).positions
+    )
+
+    modified_collection = transform.reset_time_stamps(collection, inplace=True)
+
+    assert modified_collection is collection
+    assert collection.get_item(0).time_stamps[0] == 0.0
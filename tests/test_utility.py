@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+from scipy.signal import find_peaks
+
+from aimy_target_shooting import utility
+
+
+def test_polar_transform():
+    positions = np.random.uniform(-3.0, 3.0, size=(100, 3))
+
+    spherical = utility.cartesian_to_polar_batch(positions)
+
+    np.testing.assert_allclose(utility.polar_to_cartesian_batch(spherical), positions)
+
+    for position, spherical_reference in zip(positions, spherical):
+        np.testing.assert_allclose(
+            utility.cartesian_to_polar(*position), spherical_reference
+        )
+        np.testing.assert_allclose(
+            utility.polar_to_cartesian(*spherical_reference), position
+        )
+
+
+@pytest.mark.parametrize(
+    "position, phi_reference",
+    [
+        ((1.0, 1.0, 0.5), 0.25 * np.pi),
+        ((-1.0, 1.0, 0.5), 0.75 * np.pi),
+        ((-1.0, -1.0, 0.5), -0.75 * np.pi),
+        ((-1.0, 0.0, 0.5), np.pi),
+        ((-1.0, -1e-12, 0.5), -np.pi),
+    ],
+)
+def test_polar_transform_quadrants(position, phi_reference):
+    # Azimuth is computed with arctan2 and wraps at +-pi. Points with negative
+    # x are not mirrored into (-pi/2, pi/2] as with the former arcsin formula.
+    _, phi, _ = utility.cartesian_to_polar(*position)
+    _, phi_batch, _ = utility.cartesian_to_polar_batch(position)[0]
+
+    np.testing.assert_allclose(phi, phi_reference)
+    np.testing.assert_allclose(phi_batch, phi_reference)
+
+
+def test_tuple_numpy_lists():
+    tuple_list = [tuple(sample) for sample in np.random.random_sample((20, 3))]
+
+    numpy_list = utility.to_numpy_list(tuple_list)
+
+    assert len(numpy_list) == 20
+    np.testing.assert_array_equal(numpy_list[3], tuple_list[3])
+    assert utility.to_tuple_list(numpy_list) == tuple_list
+    assert utility.to_tuple_list(np.array(tuple_list)) == tuple_list
+
+
+def test_find_rebound():
+    time_stamps = np.linspace(0.0, 1.0, 200)
+    heights = 0.76 + np.abs(np.sin(2.0 * np.pi * time_stamps + 0.5))
+    positions = np.stack((time_stamps, time_stamps, heights), axis=1)
+
+    rebound_indices = utility.find_rebound(positions)
+
+    assert len(rebound_indices) == 2
+    np.testing.assert_array_equal(
+        utility.find_rebound(positions, out=np.empty(500)), rebound_indices
+    )
+    np.testing.assert_array_equal(
+        utility.find_rebound(positions.tolist()), rebound_indices
+    )
+
+
+def test_confidence_ellipse():
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    x = np.random.randn(300)
+    y = 0.5 * x + np.random.randn(300)
+
+    _, ax = plt.subplots()
+    ellipse = utility.confidence_ellipse(x, y, ax, n_std=2.0)
+
+    cov = np.cov(x, y)
+    pearson = cov[0, 1] / np.sqrt(cov[0, 0] * cov[1, 1])
+
+    np.testing.assert_allclose(ellipse.width, 2.0 * np.sqrt(1.0 + pearson))
+    np.testing.assert_allclose(ellipse.height, 2.0 * np.sqrt(1.0 - pearson))
+
+    # Unit points of the ellipse are rotated by 45 degrees, scaled by the
+    # standard deviations and moved to the mean.
+    scale = 2.0 * np.sqrt(np.diag(cov))
+    unit_points = np.array([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])
+    expected_points = unit_points @ np.array([[1.0, 1.0], [-1.0, 1.0]]) * np.sqrt(
+        0.5
+    ) * scale + (np.mean(x), np.mean(y))
+
+    data_transform = ellipse.get_data_transform() - ax.transData
+    np.testing.assert_allclose(data_transform.transform(unit_points), expected_points)
+
+    plt.close("all")
+
+
+def test_find_rebound_candidate_region():
+    rng = np.random.default_rng(0)
+
+    for _ in range(50):
+        positions = rng.uniform(0.7, 1.2, size=(300, 3))
+        positions[rng.integers(300, size=10), 2] = 0.74
+
+        reference_indices = find_peaks(
+            0.76 - positions[:, 2], height=-0.03, distance=10
+        )[0]
+
+        np.testing.assert_array_equal(
+            utility.find_rebound(positions), reference_indices
+        )
+
+
+@pytest.mark.parametrize(
+    "transform, angle_name, angle_range",
+    [
+        (utility.f_phi, "phi", (-16.5, 16.8)),
+        (utility.f_theta, "theta", (6.5, 37.1)),
+    ],
+)
+def test_angle_actuation_transform(transform, angle_name, angle_range):
+    actuations = np.linspace(0.0, 1.0, 25)
+
+    angles = transform(actuation=actuations)
+    angles_degree = transform(actuation=actuations, radians=False)
+
+    assert angles.shape == actuations.shape
+    np.testing.assert_allclose(np.degrees(angles), angles_degree)
+    np.testing.assert_allclose(
+        [transform(actuation=actuation) for actuation in actuations], angles
+    )
+    np.testing.assert_allclose(
+        transform(**{angle_name: angles}), actuations, atol=1e-12
+    )
+
+    angles_degree = np.linspace(*angle_range, 10)
+    actuations = transform(**{angle_name: angles_degree, "radians": False})
+    np.testing.assert_allclose(
+        transform(actuation=actuations, radians=False), angles_degree
+    )
+
+    with pytest.raises(ValueError):
+        transform(actuation=np.array([0.5, 1.1]))